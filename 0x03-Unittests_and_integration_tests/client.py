@@ -8,7 +8,7 @@ from typing import (
 
 from utils import (
     get_json,
-    access_nested_map,
+    _access,
     memoize,
 )
 
@@ -44,9 +44,14 @@ class GithubOrgClient:
     def public_repos(self, license: str = None) -> List[str]:
         """Public repos"""
         json_payload = self.repos_payload
+        if license is None:
+            return [repo["name"] for repo in json_payload]
+
+        # read the license key inline rather than calling has_license per
+        # repo; a missing or null license never matches
         public_repos = [
             repo["name"] for repo in json_payload
-            if license is None or self.has_license(repo, license)
+            if (repo.get("license") or {}).get("key") == license
         ]
 
         return public_repos
@@ -55,8 +60,6 @@ class GithubOrgClient:
     def has_license(repo: Dict[str, Dict], license_key: str) -> bool:
         """Static: has_license"""
         assert license_key is not None, "license_key cannot be None"
-        try:
-            has_license = access_nested_map(repo, ("license", "key")) == license_key
-        except KeyError:
-            return False
-        return has_license
\ No newline at end of file
+        # _access returns a sentinel on a missing path, which never
+        # compares equal to a license key
+        return _access(repo, ("license", "key")) == license_key
\ No newline at end of file
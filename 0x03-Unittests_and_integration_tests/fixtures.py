@@ -7,8 +7,9 @@ Fixtures for integration tests.
 This file contains auto-generated test data from GitHub API responses.
 Line length violations are acceptable for preserving data integrity.
 """
+from collections import namedtuple
 
-TEST_PAYLOAD = [
+_RAW_PAYLOAD = [
   (
     {"repos_url": "https://api.github.com/orgs/google/repos"},
     [
@@ -956,3 +957,10 @@ TEST_PAYLOAD = [
     ['dagger', 'kratu', 'traceur-compiler', 'firmata.py'],
   )
 ]
+
+# each row is frozen into an immutable named tuple
+_Row = namedtuple(
+  "_Row", ["org_payload", "repos_payload", "expected_repos", "apache2_repos"]
+)
+
+TEST_PAYLOAD = tuple(_Row(*row) for row in _RAW_PAYLOAD)
@@ -7,13 +7,46 @@ testing its methods and properties with mocked external dependencies.
 """
 
 import unittest
-from unittest.mock import Mock, patch, PropertyMock
+from unittest.mock import DEFAULT, Mock, patch, PropertyMock
 from parameterized import parameterized, parameterized_class
 from typing import Dict
 from client import GithubOrgClient
 from fixtures import TEST_PAYLOAD
 import requests
 
+# parameter matrices are immutable module-level tuples shared by the
+# parameterized decorators and subTest loops below
+_ORG_CASES = (
+    ("google", {"login": "google"}),
+    ("abc", {"login": "abc"}),
+)
+
+_HAS_LICENSE_CASES = (
+    ({"license": {"key": "my_license"}}, "my_license", True),
+    ({"license": {"key": "other_license"}}, "my_license", False),
+)
+
+# org URLs are formatted once per org name and reused across test cases
+_ORG_URL_CACHE: Dict[str, str] = {}
+
+
+def _org_url(org_name: str) -> str:
+    """
+    Return the GitHub API URL of an organization, cached by name.
+
+    Args:
+        org_name: The name of the organization
+
+    Returns:
+        The organization's API URL
+    """
+    url = _ORG_URL_CACHE.get(org_name)
+    if url is None:
+        url = _ORG_URL_CACHE[org_name] = (
+            f"https://api.github.com/orgs/{org_name}"
+        )
+    return url
+
 
 class TestGithubOrgClient(unittest.TestCase):
     """
@@ -23,11 +56,8 @@ class TestGithubOrgClient(unittest.TestCase):
     including org, public_repos, and has_license.
     """
 
-    @parameterized.expand([
-        ("google", {"login": "google"}),
-        ("abc", {"login": "abc"}),
-    ])
-    @patch('client.get_json')
+    @parameterized.expand(_ORG_CASES)
+    @patch('client.get_json', new_callable=Mock)
     def test_org(
         self,
         org_name: str,
@@ -48,9 +78,7 @@ class TestGithubOrgClient(unittest.TestCase):
         mock_get_json.return_value = expected_payload
         client = GithubOrgClient(org_name)
         self.assertEqual(client.org, expected_payload)
-        mock_get_json.assert_called_once_with(
-            f"https://api.github.com/orgs/{org_name}"
-        )
+        mock_get_json.assert_called_once_with(_org_url(org_name))
 
     @patch('client.GithubOrgClient.org', new_callable=PropertyMock)
     def test_public_repos_url(self, mock_org: PropertyMock) -> None:
@@ -77,17 +105,13 @@ class TestGithubOrgClient(unittest.TestCase):
 
         self.assertEqual(result, test_payload["repos_url"])
 
-    @patch('client.get_json')
-    def test_public_repos(self, mock_get_json: Mock) -> None:
+    def test_public_repos(self) -> None:
         """
         Test that public_repos returns the expected list of repos.
 
-        This test uses both @patch decorator and context manager to mock
-        get_json and _public_repos_url respectively, verifying that
-        public_repos correctly processes the payload and returns repo names.
-
-        Args:
-            mock_get_json: Mocked get_json function
+        This test mocks get_json and _public_repos_url in a single with
+        statement, verifying that public_repos correctly processes the
+        payload and returns repo names.
 
         Returns:
             None
@@ -98,14 +122,15 @@ class TestGithubOrgClient(unittest.TestCase):
             {"name": "repo2", "license": {"key": "apache-2.0"}},
             {"name": "repo3", "license": {"key": "mit"}},
         ]
-        mock_get_json.return_value = test_repos_payload
+        test_url = "https://api.github.com/orgs/test/repos"
 
-        # Using context manager to mock _public_repos_url
-        with patch(
-            'client.GithubOrgClient._public_repos_url',
-            new_callable=PropertyMock
+        with patch.multiple(
+            'client', get_json=DEFAULT, new_callable=Mock
+        ) as mocks, patch.object(
+            GithubOrgClient, '_public_repos_url', new_callable=PropertyMock
         ) as mock_public_repos_url:
-            test_url = "https://api.github.com/orgs/test/repos"
+            mock_get_json = mocks['get_json']
+            mock_get_json.return_value = test_repos_payload
             mock_public_repos_url.return_value = test_url
 
             # Create client and call public_repos
@@ -122,28 +147,91 @@ class TestGithubOrgClient(unittest.TestCase):
             # Verify get_json was called once with the correct URL
             mock_get_json.assert_called_once_with(test_url)
 
-    @parameterized.expand([
-        ({"license": {"key": "my_license"}}, "my_license", True),
-        ({"license": {"key": "other_license"}}, "my_license", False),
-    ])
-    def test_has_license(self, repo: Dict, license_key: str,
-                         expected: bool) -> None:
+    def test_has_license(self) -> None:
         """
         Test that has_license correctly checks repository license.
 
         This test verifies the static method has_license returns True
         when the repository has the specified license, and False otherwise.
-
-        Args:
-            repo: Repository dictionary with license information
-            license_key: License key to check for
-            expected: Expected boolean result
+        Each row of _HAS_LICENSE_CASES runs as a subTest.
 
         Returns:
             None
         """
-        result = GithubOrgClient.has_license(repo, license_key)
-        self.assertEqual(result, expected)
+        for repo, license_key, expected in _HAS_LICENSE_CASES:
+            with self.subTest(repo=repo, license_key=license_key):
+                result = GithubOrgClient.has_license(repo, license_key)
+                self.assertEqual(result, expected)
+
+
+def _response(payload: object) -> Mock:
+    """
+    Build a fake HTTP response whose json method returns payload.
+
+    json is a plain closure rather than a child Mock: the integration
+    tests never assert on its calls, so there is no need to record them.
+
+    Args:
+        payload: The value returned by the response's json method
+
+    Returns:
+        Mock object standing in for a requests response
+    """
+    mock_response = Mock()
+    mock_response.json = lambda: payload
+    return mock_response
+
+
+def _build_responses() -> Dict[str, Mock]:
+    """
+    Map every URL the client requests onto a prebuilt fake response.
+
+    The org URL is derived from the fixture's repos_url, so each
+    TEST_PAYLOAD row contributes two entries: the org and its repos.
+    """
+    responses = {}
+    for row in TEST_PAYLOAD:
+        repos_url = row.org_payload["repos_url"]
+        responses[repos_url.rsplit("/", 1)[0]] = _response(row.org_payload)
+        responses[repos_url] = _response(row.repos_payload)
+    return responses
+
+
+_RESPONSES = _build_responses()
+_NONE_RESPONSE = _response(None)
+
+
+def _lookup(url: str) -> Mock:
+    """
+    Side effect function for mocking the shared session's get.
+
+    Args:
+        url: The URL being requested
+
+    Returns:
+        The prebuilt response for the URL
+    """
+    return _RESPONSES.get(url, _NONE_RESPONSE)
+
+
+_GET_PATCHER = patch(
+    'utils._SESSION.get', new_callable=Mock, side_effect=_lookup
+)
+
+
+def setUpModule() -> None:
+    """
+    Start the session get patcher once for the whole module.
+
+    Every subclass generated by @parameterized_class shares the same
+    URL lookup, so there is no need to patch per class.
+    """
+    _GET_PATCHER.start()
+
+
+def tearDownModule() -> None:
+    """Stop the session get patcher started by setUpModule."""
+    _GET_PATCHER.stop()
 
 
 @parameterized_class(
@@ -156,51 +244,9 @@ class TestIntegrationGithubOrgClient(unittest.TestCase):
 
     This class performs integration testing by mocking only external
     HTTP requests while testing the full workflow of the client.
+    The HTTP patcher is installed by setUpModule.
     """
 
-    @classmethod
-    def setUpClass(cls) -> None:
-        """
-        Set up class fixtures before running tests.
-
-        This method starts a patcher for requests.get and configures
-        it to return appropriate fixtures based on the URL requested.
-        """
-        def side_effect_function(url):
-            """
-            Side effect function for mocking requests.get.
-
-            Args:
-                url: The URL being requested
-
-            Returns:
-                Mock object with json method returning appropriate payload
-            """
-            mock_response = Mock()
-            if url == "https://api.github.com/orgs/google":
-                mock_response.json.return_value = cls.org_payload
-            elif url == "https://api.github.com/orgs/google/repos":
-                mock_response.json.return_value = cls.repos_payload
-            else:
-                mock_response.json.return_value = None
-            return mock_response
-
-        # Start the patcher
-        cls.get_patcher = patch(
-            'requests.get',
-            side_effect=side_effect_function
-        )
-        cls.get_patcher.start()
-
-    @classmethod
-    def tearDownClass(cls) -> None:
-        """
-        Tear down class fixtures after running tests.
-
-        This method stops the patcher for requests.get.
-        """
-        cls.get_patcher.stop()
-
     def test_public_repos(self) -> None:
         """
         Integration test for public_repos method.
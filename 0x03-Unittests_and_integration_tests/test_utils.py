@@ -7,11 +7,29 @@ access_nested_map, get_json, and memoize decorator.
 """
 import unittest
 from parameterized import parameterized
-from typing import Dict, Tuple, Any
+from typing import Dict, Any
 
 from unittest.mock import patch, Mock
 from utils import get_json, memoize
-from utils import access_nested_map
+from utils import access_nested_map, _access, _MISSING
+
+# parameter matrices are immutable module-level tuples shared by the
+# parameterized decorators and subTest loops below
+_NESTED_MAP_CASES = (
+    ({"a": 1}, ("a",), 1),
+    ({"a": {"b": 2}}, ("a",), {"b": 2}),
+    ({"a": {"b": 2}}, ("a", "b"), 2),
+)
+
+_NESTED_MAP_EXCEPTION_CASES = (
+    ({}, ("a",), "a"),
+    ({"a": 1}, ("a", "b"), "b"),
+)
+
+_GET_JSON_CASES = (
+    ("http://example.com", {"payload": True}),
+    ("http://holberton.io", {"payload": False}),
+)
 
 
 class TestAccessNestedMap(unittest.TestCase):
@@ -22,57 +40,57 @@ class TestAccessNestedMap(unittest.TestCase):
     nested dictionary structures and path sequences.
     """
 
-    @parameterized.expand([
-        ({"a": 1}, ("a",), 1),
-        ({"a": {"b": 2}}, ("a",), {"b": 2}),
-        ({"a": {"b": 2}}, ("a", "b"), 2),
-    ])
-    def test_access_nested_map(
-        self,
-        nested_map: Dict,
-        path: Tuple,
-        expected: Any
-    ) -> None:
+    def test_access_nested_map(self) -> None:
         """
         Test that access_nested_map returns correct values for valid inputs.
 
-        Args:
-            nested_map: A nested dictionary structure to access
-            path: A tuple of keys representing the path to traverse
-            expected: The expected value to be returned
+        Each row of _NESTED_MAP_CASES holds a nested dictionary, the path
+        of keys to traverse and the expected value, and runs as a subTest.
 
         Returns:
             None
         """
-        self.assertEqual(access_nested_map(nested_map, path), expected)
+        for nested_map, path, expected in _NESTED_MAP_CASES:
+            with self.subTest(nested_map=nested_map, path=path):
+                self.assertEqual(
+                    access_nested_map(nested_map, path), expected
+                )
 
-    @parameterized.expand([
-        ({}, ("a",), "a"),
-        ({"a": 1}, ("a", "b"), "b"),
-    ])
-    def test_access_nested_map_exception(
-        self,
-        nested_map: Dict,
-        path: Tuple,
-        expected_exception_message: str
-    ) -> None:
+    def test_access_nested_map_exception(self) -> None:
         """
         Test that access_nested_map raises KeyError for invalid paths.
 
-        Args:
-            nested_map: A nested dictionary structure to access
-            path: A tuple of keys representing an invalid path
-            expected_exception_message: The expected error message
+        Each row of _NESTED_MAP_EXCEPTION_CASES holds a nested dictionary,
+        an invalid path and the expected error message, and runs as a
+        subTest.
+
+        Returns:
+            None
+        """
+        for nested_map, path, expected_exception_message in (
+            _NESTED_MAP_EXCEPTION_CASES
+        ):
+            with self.subTest(nested_map=nested_map, path=path):
+                with self.assertRaises(KeyError) as context:
+                    access_nested_map(nested_map, path)
+                self.assertEqual(
+                    str(context.exception),
+                    f"'{expected_exception_message}'"
+                )
+
+    def test_access_missing_path(self) -> None:
+        """
+        Test that _access returns the _MISSING sentinel for invalid paths.
+
+        Uses the same rows as test_access_nested_map_exception, checking
+        the non-raising walker instead of the KeyError path.
 
         Returns:
             None
         """
-        with self.assertRaises(KeyError) as context:
-            access_nested_map(nested_map, path)
-        self.assertEqual(
-            str(context.exception),
-            f"'{expected_exception_message}'"
-        )
+        for nested_map, path, _ in _NESTED_MAP_EXCEPTION_CASES:
+            with self.subTest(nested_map=nested_map, path=path):
+                self.assertIs(_access(nested_map, path), _MISSING)
 
 
 class TestGetJson(unittest.TestCase):
@@ -84,11 +102,8 @@ class TestGetJson(unittest.TestCase):
     this process is mocked to avoid actual HTTP requests.
     """
 
-    @parameterized.expand([
-        ("http://example.com", {"payload": True}),
-        ("http://holberton.io", {"payload": False}),
-    ])
-    @patch('utils.requests.get')
+    @parameterized.expand(_GET_JSON_CASES)
+    @patch('utils._SESSION.get', new_callable=Mock)
     def test_get_json(
         self,
         test_url: str,
@@ -98,7 +113,7 @@ class TestGetJson(unittest.TestCase):
         """
         Test that get_json returns expected payload without HTTP calls.
 
-        Uses mocked requests.get to avoid actual network requests.
+        Uses a mocked session get to avoid actual network requests.
         """
         mock_response = Mock()
         mock_response.json.return_value = test_payload
@@ -18,6 +18,13 @@ __all__ = [
     "memoize",
 ]
 
+# sentinel telling "not cached yet" apart from a cached None
+_MISSING = object()
+
+# shared session so repeated calls reuse pooled keep-alive connections
+# instead of opening a new connection for every request
+_SESSION = requests.Session()
+
 
 # nested_map here is a parameter of type Mapping (which is like a dictionary
 # but can be more general  and path is a Sequence: ordered collection (like a list or tuple)
@@ -36,19 +43,40 @@ def access_nested_map(nested_map: Mapping, path: Sequence) -> Any:
     1
     """
     for key in path:
-        if not isinstance(nested_map, Mapping):
+        # the exact dict check is cheap and covers almost every call;
+        # only fall back to the slower Mapping ABC check for other types
+        if (type(nested_map) is not dict
+                and not isinstance(nested_map, Mapping)):
             raise KeyError(key)
         nested_map = nested_map[key]
 
     return nested_map
 
 
+def _access(nested_map: Mapping, path: Sequence) -> Any:
+    """Walk path like access_nested_map without raising.
+
+    Returns the _MISSING sentinel when a key is absent or a value along
+    the path is not a mapping, so callers that expect misses (such as
+    license checks) skip building and catching a KeyError.
+    """
+    for key in path:
+        if (type(nested_map) is not dict
+                and not isinstance(nested_map, Mapping)):
+            return _MISSING
+        nested_map = nested_map.get(key, _MISSING)
+        if nested_map is _MISSING:
+            return _MISSING
+
+    return nested_map
+
+
 
 # This is a simple wrapper function for performing an HTTP GET request and returning the result as a Python dictionary.
 def get_json(url: str) -> Dict:
     """Get JSON from remote URL.
     """
-    response = requests.get(url)
+    response = _SESSION.get(url)
     return response.json()
 
 
@@ -77,8 +105,11 @@ def memoize(fn: Callable) -> Callable:
     @wraps(fn)
     def memoized(self):
         """"memoized wraps"""
-        if not hasattr(self, attr_name):
-            setattr(self, attr_name, fn(self))
-        return getattr(self, attr_name)
+        # a single instance-dict lookup instead of hasattr/setattr/getattr
+        value = self.__dict__.get(attr_name, _MISSING)
+        if value is _MISSING:
+            value = fn(self)
+            self.__dict__[attr_name] = value
+        return value
 
     return property(memoized)
\ No newline at end of file
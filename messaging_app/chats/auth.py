@@ -8,12 +8,30 @@ token refresh, and user registration.
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.contrib.auth import authenticate
+from django.core.cache import cache
 from .models import user as User
-from .serializers import UserSerializer
+from .serializers import UserSerializer, PatchUserSerializer, USER_READ_FIELDS
+from .fast_serializers import serialize_user
+
+
+# seconds a cached /me payload may be served; bounds staleness for changes
+# that don't invalidate it explicitly
+CURRENT_USER_CACHE_TIMEOUT = 60
+
+
+def current_user_cache_key(user_pk):
+    """Cache key of the serialized current user payload"""
+    return f'user:me:{user_pk}'
+
+
+def invalidate_current_user_cache(*user_pks):
+    """Drop the cached /me payloads of the given users"""
+    cache.delete_many([current_user_cache_key(pk) for pk in user_pks])
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -50,31 +68,32 @@ class CustomTokenObtainPairView(TokenObtainPairView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Authenticate user
+        # emails are stored lowercased, so normalize before the exact lookup;
+        # a non-string email can't match any user
+        if not isinstance(email, str):
+            return Response(
+                {'error': 'Invalid credentials'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        # The parent's TokenObtainPairSerializer authenticates the user and
+        # builds the token pair in one pass
+        serializer = self.get_serializer(data={
+            'email': email.lower(),
+            'password': password,
+        })
         try:
-            user_obj = User.objects.get(email=email)
-            if user_obj.check_password(password):
-                # Generate tokens
-                refresh = RefreshToken.for_user(user_obj)
-                
-                # Serialize user data
-                user_serializer = UserSerializer(user_obj)
-                
-                return Response({
-                    'refresh': str(refresh),
-                    'access': str(refresh.access_token),
-                    'user': user_serializer.data
-                }, status=status.HTTP_200_OK)
-            else:
-                return Response(
-                    {'error': 'Invalid credentials'},
-                    status=status.HTTP_401_UNAUTHORIZED
-                )
-        except User.DoesNotExist:
+            serializer.is_valid(raise_exception=True)
+        except AuthenticationFailed:
             return Response(
                 {'error': 'Invalid credentials'},
                 status=status.HTTP_401_UNAUTHORIZED
             )
+        
+        # Serialize the user the serializer already authenticated
+        response_data = dict(serializer.validated_data)
+        response_data['user'] = serialize_user(serializer.user)
+        return Response(response_data, status=status.HTTP_200_OK)
 
 
 class RegisterView(generics.CreateAPIView):
@@ -104,7 +123,8 @@ class RegisterView(generics.CreateAPIView):
         "access": "..."
     }
     """
-    queryset = User.objects.all()
+    # user lookups made through this view never need the password columns
+    queryset = User.objects.only(*USER_READ_FIELDS)
     serializer_class = UserSerializer
     permission_classes = [AllowAny]
     
@@ -135,7 +155,7 @@ class RegisterView(generics.CreateAPIView):
         
         # Return user data with tokens
         return Response({
-            'user': UserSerializer(user_obj).data,
+            'user': serialize_user(user_obj),
             'refresh': str(refresh),
             'access': str(refresh.access_token),
             'message': 'User registered successfully'
@@ -198,8 +218,12 @@ def current_user_view(request):
         ...
     }
     """
-    serializer = UserSerializer(request.user)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    data = cache.get_or_set(
+        current_user_cache_key(request.user.pk),
+        lambda: serialize_user(request.user),
+        CURRENT_USER_CACHE_TIMEOUT
+    )
+    return Response(data, status=status.HTTP_200_OK)
 
 
 @api_view(['PUT', 'PATCH'])
@@ -223,23 +247,53 @@ def update_user_view(request):
         "first_name": "Jane",
         ...
     }
+    
+    PATCH only validates the submitted profile fields, writes them with a
+    single UPDATE and responds with user_id plus the updated fields:
+    {
+        "user_id": "...",
+        "first_name": "Jane"
+    }
     """
-    partial = request.method == 'PATCH'
+    if request.method == 'PATCH':
+        serializer = PatchUserSerializer(
+            request.user,
+            data=request.data,
+            partial=True
+        )
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+        # QuerySet.update() skips user.save(); emails are already
+        # lowercased by validate_email()
+        changes = serializer.validated_data
+        if changes:
+            User.objects.filter(pk=request.user.pk).update(**changes)
+            invalidate_current_user_cache(request.user.pk)
+        return Response(
+            {'user_id': request.user.user_id, **changes},
+            status=status.HTTP_200_OK
+        )
+    
     serializer = UserSerializer(
         request.user,
         data=request.data,
-        partial=partial
+        partial=False
     )
     
     if serializer.is_valid():
         serializer.save()
+        invalidate_current_user_cache(request.user.pk)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
     return Response(
         serializer.errors,
         status=status.HTTP_400_BAD_REQUEST
     )
-
+    
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -289,6 +343,7 @@ def change_password_view(request):
     # Set new password
     user_obj.set_password(new_password)
     user_obj.save()
+    invalidate_current_user_cache(user_obj.pk)
     
     return Response(
         {'message': 'Password changed successfully'},
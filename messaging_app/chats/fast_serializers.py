@@ -0,0 +1,194 @@
+"""
+Fast read-only serializers for the chats app.
+
+DRF's ModelSerializer resolves every field through its generic
+get_attribute/to_representation machinery on each object, which dominates
+the cost of large list responses. The serializers here precompute one
+getter per field and build plain dicts, producing the same output as their
+DRF counterparts. They are only used for GET requests; writes keep going
+through the DRF serializers for validation.
+"""
+
+from operator import attrgetter
+
+from rest_framework import serializers
+
+from .serializers import format_time_since, get_context_now
+
+
+# reuse DRF's own formatting so timestamps match the DRF serializers exactly
+_datetime = serializers.DateTimeField().to_representation
+
+
+class FastSerializer:
+    """
+    Minimal read-only serializer.
+
+    Subclasses declare `fields` as (name, attribute, to_representation)
+    triples; to_representation may also name a method of the serializer.
+    Like DRF, a None attribute is rendered as None without calling
+    to_representation. Accepts the same constructor arguments the generic
+    views pass to serializers.
+    """
+    # no per-instance __dict__; subclasses declare empty __slots__ too
+    __slots__ = ('instance', 'many', 'context', '_fields')
+
+    fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._getters = tuple(
+            (name, attrgetter(attribute), to_representation)
+            for name, attribute, to_representation in cls.fields
+        )
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context if context is not None else {}
+        self._fields = tuple(
+            (name, getter, getattr(self, to_representation)
+             if isinstance(to_representation, str) else to_representation)
+            for name, getter, to_representation in self._getters
+        )
+
+    def to_representation(self, instance):
+        """Convert an instance into a dict of primitive values."""
+        data = {}
+        for name, getter, to_representation in self._fields:
+            value = getter(instance)
+            data[name] = None if value is None else to_representation(value)
+        return data
+
+    @property
+    def data(self):
+        if self.many:
+            return [self.to_representation(obj) for obj in self.instance]
+        return self.to_representation(self.instance)
+
+
+class FastUserSerializer(FastSerializer):
+    """
+    Read-only equivalent of UserSerializer. Users must come annotated with
+    active_conversations_count (see views.annotated_users()); there is no
+    per-user COUNT fallback.
+    """
+    __slots__ = ()
+
+    fields = (
+        ('user_id', 'user_id', str),
+        ('first_name', 'first_name', str),
+        ('last_name', 'last_name', str),
+        ('email', 'email', str),
+        ('phone_number', 'phone_number', str),
+        ('role', 'role', str),
+        ('created_at', 'created_at', _datetime),
+        ('full_name', 'full_name', str),
+    )
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['active_conversations_count'] = instance.active_conversations_count
+        return data
+
+
+class FastMessageSerializer(FastSerializer):
+    """
+    Read-only equivalent of MessageSerializer. The senders are rendered by
+    FastUserSerializer, so they must be annotated too, e.g. by prefetching
+    sender_id with views.annotated_users().
+    """
+    __slots__ = ()
+
+    # the message columns the fields read
+    source_fields = (
+        'message_id',
+        'conversation_id',
+        'sender_id',
+        'message_body',
+        'sent_at',
+    )
+
+    fields = (
+        ('message_id', 'message_id', str),
+        # the raw foreign key columns, so neither related object is loaded
+        ('conversation_id', 'conversation_id_id', str),
+        ('sender_id', 'sender_id_id', str),
+        ('sender', 'sender_id', 'get_sender'),
+        ('sender_name', 'sender_id.full_name', str),
+        ('message_body', 'message_body', str),
+        ('sent_at', 'sent_at', _datetime),
+        ('time_since_sent', 'sent_at', 'get_time_since_sent'),
+    )
+
+    _sender_representation = FastUserSerializer().to_representation
+
+    def get_sender(self, sender):
+        """Serialize each distinct sender once per response"""
+        cache = self.context.setdefault('sender_cache', {})
+        data = cache.get(sender.pk)
+        if data is None:
+            data = cache[sender.pk] = self._sender_representation(sender)
+        return data
+
+    def get_time_since_sent(self, sent_at):
+        return format_time_since(sent_at, get_context_now(self.context))
+
+
+class FastMessageRowSerializer(FastSerializer):
+    """
+    FastMessageSerializer over rows of Message.objects.values(*source_fields),
+    so list responses skip building model instances altogether. The rows
+    must also carry sender_active_conversations_count (see
+    MessageViewSet.list()).
+    """
+    __slots__ = ()
+
+    # the user columns are read through the sender_id join
+    _user_fields = tuple(attribute for _, attribute, _ in FastUserSerializer.fields)
+
+    source_fields = FastMessageSerializer.source_fields + tuple(
+        'sender_id__' + attribute for attribute in _user_fields
+    )
+
+    def get_sender(self, row):
+        """Serialize each distinct sender once per response"""
+        cache = self.context.setdefault('sender_cache', {})
+        sender_pk = row['sender_id']
+        data = cache.get(sender_pk)
+        if data is None:
+            data = {}
+            for name, attribute, to_representation in FastUserSerializer.fields:
+                value = row['sender_id__' + attribute]
+                data[name] = None if value is None else to_representation(value)
+            data['active_conversations_count'] = row['sender_active_conversations_count']
+            cache[sender_pk] = data
+        return data
+
+    def to_representation(self, row):
+        sent_at = row['sent_at']
+        return {
+            'message_id': str(row['message_id']),
+            'conversation_id': str(row['conversation_id']),
+            'sender_id': str(row['sender_id']),
+            'sender': self.get_sender(row),
+            'sender_name': row['sender_id__full_name'],
+            'message_body': row['message_body'],
+            'sent_at': _datetime(sent_at),
+            'time_since_sent': format_time_since(sent_at, get_context_now(self.context)),
+        }
+
+
+_user_serializer = FastUserSerializer()
+
+
+def serialize_user(user_obj):
+    """
+    Serialize one user like UserSerializer(user_obj).data, through a shared
+    FastUserSerializer instead of building a DRF serializer per call.
+    Unless user_obj is annotated, its conversations are counted with one
+    query.
+    """
+    if not hasattr(user_obj, 'active_conversations_count'):
+        user_obj.active_conversations_count = user_obj.conversations.count()
+    return _user_serializer.to_representation(user_obj)
@@ -19,7 +19,7 @@ class MessageFilter(django_filters.FilterSet):
     - message_body: Search in message content (case-insensitive)
     - sent_at_after: Messages sent after a specific datetime
     - sent_at_before: Messages sent before a specific datetime
-    - date_range: Messages within a date range (after and before combined)
+      (both together become a single BETWEEN on sent_at)
     """
     
     # Filter by conversation ID
@@ -40,21 +40,15 @@ class MessageFilter(django_filters.FilterSet):
         lookup_expr='icontains'
     )
     
-    # Filter messages sent after a specific datetime
-    sent_at_after = django_filters.DateTimeFilter(
-        field_name='sent_at',
-        lookup_expr='gte'
-    )
-    
-    # Filter messages sent before a specific datetime
-    sent_at_before = django_filters.DateTimeFilter(
-        field_name='sent_at',
-        lookup_expr='lte'
+    # Filter by sent time, read from ?sent_at_after= and ?sent_at_before=;
+    # both bounds are inclusive as before
+    sent_at = django_filters.DateTimeFromToRangeFilter(
+        field_name='sent_at'
     )
     
     class Meta:
         model = Message
-        fields = ['conversation', 'sender', 'message_body', 'sent_at_after', 'sent_at_before']
+        fields = ['conversation', 'sender', 'message_body', 'sent_at']
 
 
 class ConversationFilter(django_filters.FilterSet):
@@ -74,10 +68,9 @@ class ConversationFilter(django_filters.FilterSet):
         lookup_expr='exact'
     )
     
-    # Filter by participant email
+    # Filter by participant email (case-insensitive)
     participant_email = django_filters.CharFilter(
-        field_name='participants_id__email',
-        lookup_expr='iexact'
+        method='filter_participant_email'
     )
     
     # Filter conversations created after a specific datetime
@@ -92,6 +85,14 @@ class ConversationFilter(django_filters.FilterSet):
         lookup_expr='lte'
     )
     
+    def filter_participant_email(self, queryset, name, value):
+        """
+        Emails are stored lowercased, so an exact match on the lowercased
+        value behaves like iexact while still using the unique email index
+        (SQLite runs iexact as an unindexed LIKE).
+        """
+        return queryset.filter(participants_id__email=value.lower())
+    
     class Meta:
         model = Conversation
         fields = ['participant', 'participant_email', 'created_after', 'created_before']
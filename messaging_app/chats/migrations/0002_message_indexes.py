@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-14 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation_id', '-sent_at'], name='msg_conv_sent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['sender_id', '-sent_at'], name='msg_sender_sent_idx'),
+        ),
+    ]
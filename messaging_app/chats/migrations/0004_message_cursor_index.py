@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-14 16:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0003_user_full_name'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='message',
+            name='msg_conv_sent_idx',
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation_id', '-sent_at', '-message_id'], name='msg_conv_sent_id_idx'),
+        ),
+    ]
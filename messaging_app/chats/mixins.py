@@ -0,0 +1,99 @@
+"""
+View mixins for the chats app.
+
+This module provides AutoPrefetchMixin, which derives select_related() and
+prefetch_related() lookups from a view's serializer fields.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def collect_related_lookups(serializer, model, prefix='', in_prefetch=False, select=None, prefetch=None):
+    """
+    Walk the fields of `serializer` (rendering instances of `model`) and
+    collect the relation paths they traverse.
+
+    Forward FK/one-to-one paths go to `select`; paths through a
+    many-to-many or reverse relation, and anything below them, go to
+    `prefetch`. Nested serializers are walked recursively. Primary key
+    related fields only read the FK column and add nothing, and method
+    fields (source '*') can't be inspected.
+
+    Returns the (select, prefetch) lists.
+    """
+    select = [] if select is None else select
+    prefetch = [] if prefetch is None else prefetch
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        current_model, path, many = model, prefix, in_prefetch
+        source_attrs = field.source_attrs
+        for index, attr in enumerate(source_attrs):
+            try:
+                model_field = current_model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            if not model_field.is_relation:
+                break
+            to_many = model_field.many_to_many or model_field.one_to_many
+            if (isinstance(field, serializers.PrimaryKeyRelatedField)
+                    and index == len(source_attrs) - 1 and not to_many):
+                break
+
+            path = f'{path}__{attr}' if path else attr
+            many = many or to_many
+            (prefetch if many else select).append(path)
+            current_model = model_field.related_model
+        else:
+            # the whole source is a relation: look inside nested serializers
+            child = field.child if isinstance(field, serializers.ListSerializer) else field
+            if path and isinstance(child, serializers.Serializer):
+                collect_related_lookups(child, current_model, path, many, select, prefetch)
+
+    return select, prefetch
+
+
+class AutoPrefetchMixin:
+    """
+    Mixin for generic views that applies the select_related() and
+    prefetch_related() lookups the view's serializer needs, so adding a
+    nested or dotted-source field doesn't silently bring back N+1 queries.
+
+    Views call self.auto_prefetch(queryset) from get_queryset(). Lookups the
+    queryset already prefetches (e.g. a Prefetch with a custom queryset) are
+    left as they are, and aren't select_related() either, which would fill
+    in the related objects before the Prefetch could.
+    """
+
+    def get_prefetch_serializer_class(self):
+        """
+        Serializer class to inspect. Falls back to `serializer_class` when
+        the request uses a serializer that isn't a DRF serializer (the fast
+        read serializers), which renders the same relations.
+        """
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, serializers.BaseSerializer):
+            serializer_class = self.serializer_class
+        return serializer_class
+
+    def auto_prefetch(self, queryset):
+        """Return `queryset` with the serializer's related lookups applied."""
+        select, prefetch = collect_related_lookups(
+            self.get_prefetch_serializer_class()(), queryset.model
+        )
+
+        existing = {
+            getattr(lookup, 'prefetch_to', lookup)
+            for lookup in queryset._prefetch_related_lookups
+        }
+        select = [lookup for lookup in dict.fromkeys(select) if lookup not in existing]
+        prefetch = [lookup for lookup in dict.fromkeys(prefetch) if lookup not in existing]
+
+        if select and queryset.query.select_related is not True:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
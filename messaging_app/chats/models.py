@@ -1,5 +1,7 @@
 from uuid import uuid4
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Concat
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin  
 
 # Create your models here.
@@ -27,12 +29,34 @@ class user(AbstractBaseUser):
         null=False
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # computed and stored by the database, so reads don't build it per row
+    full_name = models.GeneratedField(
+        expression=Concat('first_name', Value(' '), 'last_name'),
+        output_field=models.CharField(max_length=61),
+        db_persist=True,
+    )
+    
+    # provides get_by_natural_key(), which authenticate() needs to look
+    # users up by USERNAME_FIELD
+    objects = BaseUserManager()
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name', 'last_name']
     
     def __str__(self):
         return self.email
+    
+    def save(self, *args, **kwargs):
+        # store emails lowercased so logins can use an exact (indexed) lookup
+        if self.email:
+            self.email = self.email.lower()
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        # an insert returns the generated full_name, an update doesn't; drop
+        # the stale value so it is reloaded from the database on next access
+        update_fields = kwargs.get('update_fields')
+        if not adding and (update_fields is None or {'first_name', 'last_name'} & set(update_fields)):
+            self.__dict__.pop('full_name', None)
 
 # conversation model
 class Conversation(models.Model):
@@ -49,4 +73,13 @@ class Message(models.Model):
     conversation_id = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='messages', null=False)
     sender_id = models.ForeignKey(user, on_delete=models.CASCADE, related_name='sent_messages')
     message_body = models.TextField(null=False)
-    sent_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    sent_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        # conversation_id + sent_at serves "messages in a conversation by
+        # recency" (nested serialization, last message preview, cursor
+        # pagination, whose tie-breaker message_id closes the key)
+        indexes = [
+            models.Index(fields=['conversation_id', '-sent_at', '-message_id'], name='msg_conv_sent_id_idx'),
+            models.Index(fields=['sender_id', '-sent_at'], name='msg_sender_sent_idx'),
+        ]
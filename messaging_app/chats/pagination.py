@@ -5,7 +5,7 @@ This module defines custom pagination classes to control
 how data is paginated in API responses.
 """
 
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 
 class MessagePagination(PageNumberPagination):
@@ -50,3 +50,41 @@ class MessagePagination(PageNumberPagination):
         response.data['count'] = total_count
 
         return response
+
+
+class MessageCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination for message listings, newest first.
+    
+    Each page is fetched with a WHERE on the last seen sent_at instead of an
+    OFFSET over the whole history, and no COUNT(*) is run, so a page costs
+    about the same however deep the history goes. The cursor holds only that
+    sent_at plus a small offset that steps past messages sharing it, so a
+    large number of messages with the same sent_at would still be skipped
+    row by row. message_id only keeps the order of such ties deterministic;
+    it is not part of the cursor. The same tie-breaker is added to orderings
+    requested with ?ordering=.
+    
+    Example API Response:
+        {
+            "next": "http://api.example.com/messages/?cursor=cD0yMDI1...",
+            "previous": null,
+            "results": [
+                { message objects... }
+            ]
+        }
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-sent_at', '-message_id')
+    
+    def get_ordering(self, request, queryset, view):
+        """
+        The requested (or default) ordering, closed by message_id in the
+        direction of its first field.
+        """
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        if not any(field.lstrip('-') == 'message_id' for field in ordering):
+            ordering += ('-message_id' if ordering[0].startswith('-') else 'message_id',)
+        return ordering
@@ -0,0 +1,40 @@
+"""
+Renderers for the chats app.
+
+This module provides a JSON renderer backed by orjson, which encodes
+responses in C instead of the stdlib json module DRF uses by default.
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that serializes response data with orjson.
+
+    UUIDs and datetimes are encoded natively; anything orjson doesn't know
+    (Decimal, lazy translation strings, querysets, ...) falls back to DRF's
+    own JSONEncoder so the output matches the default renderer.
+    """
+    media_type = 'application/json'
+    format = 'json'
+
+    # OPT_UTC_Z renders UTC offsets as "Z", like DRF's encoder does
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+    _default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render `data` into JSON bytes."""
+        if data is None:
+            return b''
+
+        options = self.options
+        # orjson only supports two-space indentation; honour any requested
+        # indent (e.g. from the browsable API) with it
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=self._default, option=options)
@@ -1,11 +1,30 @@
+from uuid import UUID
+
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 from .models import user, Message, Conversation
+from .permissions import get_user_conversation_ids
+
+
+# model columns UserSerializer actually reads; querysets that only feed
+# user representations can load these with .only()
+USER_READ_FIELDS = (
+    'user_id',
+    'first_name',
+    'last_name',
+    'email',
+    'phone_number',
+    'role',
+    'created_at',
+    'full_name',
+)
 
 
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for User model"""
     
-    # CharField for computed full name
+    # CharField for the full name generated by the database
     full_name = serializers.CharField(read_only=True)
     
     # SerializerMethodField for conversation count
@@ -35,11 +54,24 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['user_id', 'created_at']
         # extra kwargs to make password_hash write-only field
         extra_kwargs = {
-            'password_hash': {'write_only': True}
+            'password_hash': {'write_only': True},
+            # runs before validate_email() lowercases the value, so compare
+            # case-insensitively against the (lowercased) stored emails
+            'email': {'validators': [
+                UniqueValidator(
+                    queryset=user.objects.all(),
+                    lookup='iexact',
+                    message='user with this email already exists.',
+                )
+            ]},
         }
     
     def get_active_conversations_count(self, obj):
         """Count user's active conversations"""
+        # annotated by querysets that render many users (see
+        # ConversationViewSet.get_queryset()), saving a COUNT per user
+        if hasattr(obj, 'active_conversations_count'):
+            return obj.active_conversations_count
         return obj.conversations.count()
     
     def validate_email(self, value):
@@ -76,12 +108,88 @@ class UserSerializer(serializers.ModelSerializer):
         return user_instance
 
 
+class PatchUserSerializer(UserSerializer):
+    """
+    Validates the editable profile fields of a PATCH request only.
+    Reuses UserSerializer's field validation without its computed
+    (and COUNT-querying) output fields or the password fields.
+    """
+    full_name = None
+    active_conversations_count = None
+    password = None
+    password_confirm = None
+    
+    class Meta(UserSerializer.Meta):
+        fields = [
+            'first_name',
+            'last_name',
+            'email',
+            'phone_number',
+            'role',
+        ]
+
+
+def get_context_now(context):
+    """Return the current time, taken once per serialization and kept in
+    context['now'] so every message of a response is dated from the same
+    instant.
+    """
+    now = context.get('now')
+    if now is None:
+        now = context['now'] = timezone.now()
+    return now
+
+
+def format_time_since(sent_at, now=None):
+    """Format how long ago a message was sent, e.g. "5m ago".
+    Shared by MessageSerializer and the fast read serializers.
+    """
+    if now is None:
+        now = timezone.now()
+    delta = now - sent_at
+    days, seconds = delta.days, delta.seconds
+    
+    if days > 0:
+        return f"{days}d ago"
+    elif seconds > 3600:
+        return f"{seconds // 3600}h ago"
+    elif seconds > 60:
+        return f"{seconds // 60}m ago"
+    else:
+        return "just now"
+
+
+class ParticipantConversationField(serializers.PrimaryKeyRelatedField):
+    """
+    Conversation primary key field that skips the lookup query for
+    conversations the requesting user participates in. The permission
+    check already loaded those ids, and membership implies the
+    conversation exists, so a bare instance carrying the pk is enough to
+    save the foreign key. Other ids are looked up (and rejected) as usual.
+    """
+    
+    def to_internal_value(self, data):
+        request = self.context.get('request')
+        if request is not None and request.user.is_authenticated:
+            try:
+                pk = UUID(str(data))
+            except ValueError:
+                pk = None
+            if pk is not None and pk in get_user_conversation_ids(request):
+                return Conversation(pk=pk)
+        return super().to_internal_value(data)
+
+
 class MessageSerializer(serializers.ModelSerializer):
     """Serializer for Message model"""
-    sender = UserSerializer(source='sender_id', read_only=True)
+    # validated against the user's conversations without another query
+    conversation_id = ParticipantConversationField(queryset=Conversation.objects.all())
+    
+    # SerializerMethodField so each distinct sender is serialized once
+    sender = serializers.SerializerMethodField()
     
     # CharField for sender name
-    sender_name = serializers.CharField(read_only=True)
+    sender_name = serializers.CharField(source='sender_id.full_name', read_only=True)
     
     # SerializerMethodField for time since sent
     time_since_sent = serializers.SerializerMethodField()
@@ -98,21 +206,24 @@ class MessageSerializer(serializers.ModelSerializer):
             'sent_at',
             'time_since_sent'
         ]
-        read_only_fields = ['message_id', 'sent_at']
+        # the sender is always the authenticated user, set by the view
+        read_only_fields = ['message_id', 'sender_id', 'sent_at']
+    
+    def get_sender(self, obj):
+        """
+        Serialize the sender, memoized per user in context['sender_cache']
+        so a page of messages from a few senders doesn't re-run
+        UserSerializer (and its COUNT query) for every message.
+        """
+        cache = self.context.setdefault('sender_cache', {})
+        data = cache.get(obj.sender_id_id)
+        if data is None:
+            data = cache[obj.sender_id_id] = UserSerializer(obj.sender_id, context=self.context).data
+        return data
     
     def get_time_since_sent(self, obj):
         """Calculate time since message was sent"""
-        from django.utils import timezone
-        delta = timezone.now() - obj.sent_at
-        
-        if delta.days > 0:
-            return f"{delta.days}d ago"
-        elif delta.seconds > 3600:
-            return f"{delta.seconds // 3600}h ago"
-        elif delta.seconds > 60:
-            return f"{delta.seconds // 60}m ago"
-        else:
-            return "just now"
+        return format_time_since(obj.sent_at, get_context_now(self.context))
     
     def validate_message_body(self, value):
         """Validate message content with ValidationError"""
@@ -123,18 +234,16 @@ class MessageSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Message exceeds maximum length of 10,000 characters")
         return cleaned
     
-    def validate(self, data):
-        """Validate sender is participant"""
-        sender = data.get('sender_id')
-        conversation = data.get('conversation_id')
-        
-        if sender and conversation:
-            if not conversation.participants_id.filter(user_id=sender.user_id).exists():
-                raise serializers.ValidationError({
-                    "sender_id": "Sender must be a participant in this conversation"
-                })
-        
-        return data
+    def get_fields(self):
+        """
+        On the nested /conversations/{pk}/messages/ route the conversation
+        comes from the URL, so it isn't read from the payload.
+        """
+        fields = super().get_fields()
+        view = self.context.get('view')
+        if view is not None and view.kwargs.get('conversation_pk'):
+            fields['conversation_id'].read_only = True
+        return fields
 
 
 #  nested structure: Conversation → Messages → Sender (User)
@@ -147,7 +256,7 @@ class ConversationSerializer(serializers.ModelSerializer):
     and messages from message serializer.
     """
     participants = UserSerializer(source='participants_id', many=True, read_only=True)
-    messages = MessageSerializer(many=True, read_only=True)
+    messages = serializers.SerializerMethodField()
     
     # SerializerMethodFields for computed data
     message_count = serializers.SerializerMethodField()
@@ -168,20 +277,39 @@ class ConversationSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['conversation_id', 'created_at']
     
+    # The getters below read the prefetched messages and annotations added
+    # by ConversationViewSet.get_queryset() and only fall back to a query
+    # for instances that weren't loaded through it (e.g. right after create).
+    
+    def get_messages(self, obj):
+        """Serialize the conversation's latest messages"""
+        messages = getattr(obj, 'recent_messages', None)
+        if messages is None:
+            messages = obj.messages.select_related('sender_id').order_by('-sent_at')
+        return MessageSerializer(messages, many=True, context=self.context).data
+    
     def get_message_count(self, obj):
         """Count total messages in conversation"""
+        if hasattr(obj, 'message_count'):
+            return obj.message_count
         return obj.messages.count()
     
     def get_last_message_preview(self, obj):
         """Get preview of last message"""
-        last_msg = obj.messages.order_by('-sent_at').first()
-        if last_msg:
-            preview = last_msg.message_body[:50]
-            return preview + "..." if len(last_msg.message_body) > 50 else preview
-        return None
+        if hasattr(obj, 'last_message_preview'):
+            body = obj.last_message_preview
+        else:
+            last_msg = obj.messages.order_by('-sent_at').first()
+            body = last_msg.message_body if last_msg else None
+        if body is None:
+            return None
+        preview = body[:50]
+        return preview + "..." if len(body) > 50 else preview
     
     def get_last_message_at(self, obj):
         """Get timestamp of last message"""
+        if hasattr(obj, 'last_message_at'):
+            return obj.last_message_at
         last_msg = obj.messages.order_by('-sent_at').first()
         return last_msg.sent_at if last_msg else None
     
@@ -202,3 +330,16 @@ class ConversationSerializer(serializers.ModelSerializer):
             })
         
         return data
+
+
+class ConversationListSerializer(ConversationSerializer):
+    """Conversation list entries: ConversationSerializer without the
+    nested messages, which the list view doesn't need.
+    """
+    messages = None
+    
+    class Meta(ConversationSerializer.Meta):
+        fields = [
+            field for field in ConversationSerializer.Meta.fields
+            if field != 'messages'
+        ]
@@ -1,3 +1,434 @@
-from django.test import TestCase
+"""
+Tests for the chats app API.
+"""
 
-# Create your tests here.
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .fast_serializers import FastUserSerializer
+from .models import user as User, Conversation, Message
+from .permissions import get_user_conversation_ids
+from .serializers import MessageSerializer
+
+
+# the project's Argon2 hasher is deliberately slow; tests don't need that
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ChatsAPITestCase(APITestCase):
+    """Base class: a few users and conversations, authenticated as alice."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = cls.create_user('alice@example.com', 'Alice', 'Smith')
+        cls.bob = cls.create_user('bob@example.com', 'Bob', 'Jones')
+        cls.carol = cls.create_user('carol@example.com', 'Carol', 'White')
+
+        cls.alice_bob = Conversation.objects.create()
+        cls.alice_bob.participants_id.add(cls.alice, cls.bob)
+        cls.bob_carol = Conversation.objects.create()
+        cls.bob_carol.participants_id.add(cls.bob, cls.carol)
+
+    @staticmethod
+    def create_user(email, first_name, last_name, password='password123'):
+        user_obj = User(email=email, first_name=first_name, last_name=last_name)
+        user_obj.set_password(password)
+        user_obj.save()
+        return user_obj
+
+    def setUp(self):
+        # /me responses are cached between requests
+        cache.clear()
+        self.client.force_authenticate(self.alice)
+
+
+class MessageListTests(ChatsAPITestCase):
+
+    def test_list_runs_one_query_however_many_senders(self):
+        Message.objects.create(conversation_id=self.alice_bob, sender_id=self.alice, message_body='hi')
+        for i in range(3):
+            Message.objects.create(conversation_id=self.alice_bob, sender_id=self.bob, message_body=f'hey {i}')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('message-list'))
+
+        self.assertEqual(response.status_code, 200)
+        senders = {
+            message['sender_id']: message['sender']['active_conversations_count']
+            for message in response.data['results']
+        }
+        self.assertEqual(senders, {str(self.alice.pk): 1, str(self.bob.pk): 2})
+
+
+class SenderConversationCountTests(ChatsAPITestCase):
+    """Every message path renders its senders without a COUNT per user."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.group = Conversation.objects.create()
+        cls.group.participants_id.add(cls.alice, cls.bob, cls.carol)
+        for sender in (cls.alice, cls.bob, cls.carol):
+            Message.objects.create(conversation_id=cls.group, sender_id=sender, message_body='hello')
+
+    def assertSenderCounts(self, messages):
+        counts = {
+            str(message['sender_id']): message['sender']['active_conversations_count']
+            for message in messages
+        }
+        self.assertEqual(counts, {
+            str(self.alice.pk): 2, str(self.bob.pk): 3, str(self.carol.pk): 2,
+        })
+
+    def test_conversation_messages(self):
+        url = reverse('conversation-messages', args=[self.group.pk])
+        # conversation, its participants, the permission check, the page
+        # count, the page and its senders
+        with self.assertNumQueries(6):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertSenderCounts(response.data['results'])
+
+    def test_conversation_detail(self):
+        url = reverse('conversation-detail', args=[self.group.pk])
+        # conversation, participants, recent messages, their senders and
+        # the permission check
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertSenderCounts(response.data['messages'])
+
+    def test_message_detail(self):
+        message = Message.objects.filter(sender_id=self.bob).first()
+        # message, its sender and the permission check (alice isn't the sender)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('message-detail', args=[message.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['sender']['active_conversations_count'], 3)
+
+    def test_unannotated_users_are_rejected(self):
+        with self.assertRaises(AttributeError):
+            FastUserSerializer(User.objects.get(pk=self.bob.pk)).data
+
+
+class NestedMessageRouteTests(ChatsAPITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.message = Message.objects.create(
+            conversation_id=cls.alice_bob, sender_id=cls.alice, message_body='hi'
+        )
+
+    def nested_url(self, conversation_pk):
+        return reverse('conversation-messages-detail', kwargs={
+            'conversation_pk': conversation_pk, 'pk': self.message.pk,
+        })
+
+    def test_malformed_conversation_id_is_not_found(self):
+        url = self.nested_url('not-a-uuid')
+        self.assertEqual(self.client.get(url).status_code, 404)
+        response = self.client.patch(url, {'message_body': 'edited'}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.message.refresh_from_db()
+        self.assertEqual(self.message.message_body, 'hi')
+
+    def test_participant_can_edit_through_nested_route(self):
+        response = self.client.patch(
+            self.nested_url(self.alice_bob.pk), {'message_body': 'edited'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['message_body'], 'edited')
+
+    def test_non_participant_is_forbidden(self):
+        self.client.force_authenticate(self.carol)
+        response = self.client.patch(
+            self.nested_url(self.alice_bob.pk), {'message_body': 'edited'}, format='json'
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+class EmailCaseTests(ChatsAPITestCase):
+    """Emails are stored lowercased and compared case-insensitively."""
+
+    def test_save_lowercases_email(self):
+        user_obj = self.create_user('Dave@Example.COM', 'Dave', 'Brown')
+        user_obj.refresh_from_db()
+        self.assertEqual(user_obj.email, 'dave@example.com')
+
+    def test_register_rejects_email_differing_only_in_case(self):
+        response = self.client.post(reverse('register'), {
+            'email': 'ALICE@example.com',
+            'password': 'password123',
+            'password_confirm': 'password123',
+            'first_name': 'Other',
+            'last_name': 'Alice',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data)
+        self.assertEqual(User.objects.filter(email__iexact='alice@example.com').count(), 1)
+
+    def test_patch_rejects_email_differing_only_in_case(self):
+        response = self.client.patch(reverse('update-user'), {'email': 'Bob@Example.com'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data)
+
+    def test_patch_keeps_own_email_in_other_case(self):
+        response = self.client.patch(reverse('update-user'), {'email': 'ALICE@example.com'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['email'], 'alice@example.com')
+
+
+class LoginTests(ChatsAPITestCase):
+
+    def login(self, email, password='password123'):
+        self.client.force_authenticate(None)
+        return self.client.post(reverse('login'), {'email': email, 'password': password}, format='json')
+
+    def test_mixed_case_email(self):
+        response = self.login('Alice@EXAMPLE.com')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.data)
+        self.assertEqual(response.data['user']['user_id'], str(self.alice.pk))
+
+    def test_wrong_password(self):
+        response = self.login('alice@example.com', 'wrong')
+        self.assertEqual(response.status_code, 401)
+
+    def test_non_string_email(self):
+        for email in (['alice@example.com'], {'email': 'alice@example.com'}, 42):
+            with self.subTest(email=email):
+                response = self.login(email)
+                self.assertEqual(response.status_code, 401)
+                self.assertEqual(response.data, {'error': 'Invalid credentials'})
+
+
+class UserFullNameTests(TestCase):
+    """full_name is generated by the database from first and last name."""
+
+    def test_generated_on_insert(self):
+        user_obj = User.objects.create(email='eve@example.com', first_name='Eve', last_name='Adams')
+        self.assertEqual(user_obj.full_name, 'Eve Adams')
+
+    def test_reloaded_after_renaming(self):
+        user_obj = User.objects.create(email='eve@example.com', first_name='Eve', last_name='Adams')
+        user_obj.last_name = 'Baker'
+        user_obj.save()
+        self.assertEqual(user_obj.full_name, 'Eve Baker')
+
+        user_obj.first_name = 'Evelyn'
+        user_obj.save(update_fields=['first_name'])
+        self.assertEqual(user_obj.full_name, 'Evelyn Baker')
+
+    def test_kept_when_names_are_not_saved(self):
+        user_obj = User.objects.create(email='eve@example.com', first_name='Eve', last_name='Adams')
+        user_obj.phone_number = '555-123-4567'
+        with self.assertNumQueries(1):
+            user_obj.save(update_fields=['phone_number'])
+            self.assertEqual(user_obj.full_name, 'Eve Adams')
+
+
+class PatchCurrentUserTests(ChatsAPITestCase):
+    """PATCH on the current user writes with a single UPDATE."""
+
+    def test_patch_names(self):
+        with self.assertNumQueries(1):
+            response = self.client.patch(
+                reverse('update-user'), {'first_name': 'Alicia', 'last_name': 'Stone'}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {
+            'user_id': self.alice.pk, 'first_name': 'Alicia', 'last_name': 'Stone',
+        })
+        alice = User.objects.get(pk=self.alice.pk)
+        self.assertEqual((alice.first_name, alice.last_name), ('Alicia', 'Stone'))
+        # QuerySet.update() skips save(); the database recomputes full_name
+        self.assertEqual(alice.full_name, 'Alicia Stone')
+
+    def test_patch_email_is_lowercased(self):
+        response = self.client.patch(reverse('update-user'), {'email': 'Alicia@Example.com'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['email'], 'alicia@example.com')
+        self.assertEqual(User.objects.get(pk=self.alice.pk).email, 'alicia@example.com')
+
+    def test_invalid_field_changes_nothing(self):
+        response = self.client.patch(
+            reverse('update-user'), {'first_name': 'Alicia', 'phone_number': '123'}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('phone_number', response.data)
+        self.assertEqual(User.objects.get(pk=self.alice.pk).first_name, 'Alice')
+
+    def test_read_only_fields_are_ignored(self):
+        response = self.client.patch(
+            reverse('update-user'), {'full_name': 'Someone Else', 'user_id': str(self.bob.pk)}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'user_id': self.alice.pk})
+        self.assertEqual(User.objects.get(pk=self.alice.pk).full_name, 'Alice Smith')
+
+
+class CurrentUserCacheTests(ChatsAPITestCase):
+    """/me is cached, and the cache is dropped when the user changes."""
+
+    def setUp(self):
+        super().setUp()
+        # authenticate like a real client, so each request loads the user
+        # afresh instead of reusing the force_authenticate()d instance
+        self.client.force_authenticate(None)
+        access = RefreshToken.for_user(self.alice).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_repeated_reads_are_cached(self):
+        url = reverse('current-user')
+        self.client.get(url)
+        # only the token's user is loaded; the payload comes from the cache
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.data['email'], 'alice@example.com')
+        self.assertEqual(response.data['active_conversations_count'], 1)
+
+    def test_patch_is_reflected_immediately(self):
+        url = reverse('current-user')
+        self.assertEqual(self.client.get(url).data['full_name'], 'Alice Smith')
+
+        response = self.client.patch(
+            reverse('update-user'), {'first_name': 'Alicia', 'email': 'Alicia@Example.com'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        data = self.client.get(url).data
+        self.assertEqual(data['first_name'], 'Alicia')
+        self.assertEqual(data['full_name'], 'Alicia Smith')
+        self.assertEqual(data['email'], 'alicia@example.com')
+
+    def test_new_conversation_is_reflected_immediately(self):
+        url = reverse('current-user')
+        self.assertEqual(self.client.get(url).data['active_conversations_count'], 1)
+
+        response = self.client.post(
+            reverse('conversation-list'), {'participants_id': [str(self.carol.pk)]}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(self.client.get(url).data['active_conversations_count'], 2)
+
+
+class MessageCursorPaginationTests(ChatsAPITestCase):
+    """/messages/ pages with cursors: next/previous links and no count."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.messages = [
+            Message.objects.create(conversation_id=cls.alice_bob, sender_id=cls.bob, message_body=f'm{i}')
+            for i in range(7)
+        ]
+        # five of them sent at the very same instant, straddling the pages
+        tied = [message.pk for message in cls.messages[1:6]]
+        Message.objects.filter(pk__in=tied).update(sent_at=cls.messages[1].sent_at)
+
+    def walk(self, url):
+        """Follow next links from url; return the pages' message ids and responses."""
+        pages, responses = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            responses.append(response)
+            pages.append([message['message_id'] for message in response.data['results']])
+            url = response.data['next']
+        return pages, responses
+
+    def expected_order(self, *ordering):
+        return [str(pk) for pk in Message.objects.order_by(*ordering).values_list('pk', flat=True)]
+
+    def test_response_shape(self):
+        response = self.client.get(reverse('message-list'))
+        self.assertEqual(list(response.data), ['next', 'previous', 'results'])
+        self.assertEqual(len(response.data['results']), 7)
+
+    def test_next_pages_step_through_ties(self):
+        pages, responses = self.walk(reverse('message-list') + '?page_size=2')
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+        self.assertEqual(sum(pages, []), self.expected_order('-sent_at', '-message_id'))
+        self.assertIsNone(responses[0].data['previous'])
+
+    def test_previous_pages_step_back_through_ties(self):
+        pages, responses = self.walk(reverse('message-list') + '?page_size=2')
+        url, seen = responses[-1].data['previous'], []
+        while url:
+            response = self.client.get(url)
+            seen.insert(0, [message['message_id'] for message in response.data['results']])
+            url = response.data['previous']
+        self.assertEqual(seen, pages[:-1])
+
+    def test_ordering_oldest_first(self):
+        pages, _ = self.walk(reverse('message-list') + '?page_size=2&ordering=sent_at')
+        self.assertEqual(sum(pages, []), self.expected_order('sent_at', 'message_id'))
+
+    def test_default_is_newest_first(self):
+        pages, _ = self.walk(reverse('message-list') + '?page_size=3')
+        ids = sum(pages, [])
+        self.assertEqual(ids[0], str(self.messages[-1].pk))
+        self.assertEqual(ids[-1], str(self.messages[0].pk))
+
+
+class PostMessageTests(ChatsAPITestCase):
+    """Posting a message validates the conversation from the user's own ids."""
+
+    def post(self, conversation_id, body='hello'):
+        return self.client.post(
+            reverse('message-list'),
+            {'conversation_id': str(conversation_id), 'message_body': body},
+            format='json',
+        )
+
+    def test_participant_posts_without_conversation_lookup(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(self.alice_bob.pk)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['conversation_id'], self.alice_bob.pk)
+        self.assertEqual(response.data['sender_id'], self.alice.pk)
+        self.assertTrue(Message.objects.filter(conversation_id=self.alice_bob, message_body='hello').exists())
+        # the permission check's participation query, the INSERT and the
+        # sender's conversation count; no SELECT of the conversation itself
+        self.assertEqual(len(queries), 3, [query['sql'] for query in queries])
+        self.assertFalse(any(
+            query['sql'].startswith('SELECT') and self.alice_bob.pk.hex in query['sql']
+            for query in queries
+        ))
+
+    def test_non_participant_is_forbidden(self):
+        response = self.post(self.bob_carol.pk)
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Message.objects.filter(conversation_id=self.bob_carol).exists())
+
+    def test_unknown_conversation_is_forbidden(self):
+        response = self.post(uuid4())
+        self.assertEqual(response.status_code, 403)
+
+    def test_malformed_conversation_id_is_invalid(self):
+        response = self.post('not-a-uuid')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('conversation_id', response.data)
+
+    def test_field_looks_up_other_conversations(self):
+        # ids outside the user's conversations still go through the regular
+        # lookup, which only rejects conversations that don't exist; the
+        # permission check is what keeps non-participants out
+        request = APIRequestFactory().post('/')
+        request.user = self.alice
+        get_user_conversation_ids(request)
+        for conversation_id, valid in ((self.bob_carol.pk, True), (uuid4(), False)):
+            with self.subTest(valid=valid):
+                serializer = MessageSerializer(
+                    data={'conversation_id': str(conversation_id), 'message_body': 'hi'},
+                    context={'request': request},
+                )
+                with self.assertNumQueries(1):
+                    self.assertEqual(serializer.is_valid(), valid)
@@ -4,11 +4,23 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
+from django.db.models import Count, Max, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Substr
 from .models import user, Message, Conversation
-from .serializers import UserSerializer, MessageSerializer, ConversationSerializer
+from .serializers import (
+    UserSerializer, MessageSerializer, ConversationSerializer, ConversationListSerializer,
+    USER_READ_FIELDS,
+)
+from .fast_serializers import FastMessageSerializer, FastMessageRowSerializer
 from .permissions import IsParticipantOfConversation, IsMessageSenderOrRecipient
 from .filters import MessageFilter, ConversationFilter
-from .pagination import MessagePagination
+from .pagination import MessagePagination, MessageCursorPagination
+from .mixins import AutoPrefetchMixin
+from .auth import invalidate_current_user_cache
+
+
+# the conversation <-> user through table, for participation counts
+Participant = Conversation.participants_id.through
 
 
 # class UserViewSet(viewsets.ModelViewSet):
@@ -20,7 +32,54 @@ from .pagination import MessagePagination
 #     serializer_class = UserSerializer
 
 
-class ConversationViewSet(viewsets.ModelViewSet):
+def participant_conversation_ids(request):
+    """
+    Subquery of the ids of the conversations the requesting user
+    participates in, read straight from the participants through table.
+    Filtering with conversation_id__in=... makes a semi-join, so the
+    querysets need no DISTINCT to undo an M2M join.
+    """
+    return Conversation.participants_id.through.objects.filter(
+        user_id=request.user.user_id
+    ).values('conversation_id')
+
+
+def active_conversations_count(user_ref):
+    """
+    Correlated subquery counting the conversations of the user user_ref
+    (e.g. OuterRef('pk')) points at, read straight from the participants
+    through table. A Count() over the M2M would reuse the joins of the
+    outer query and only count the conversations it selects.
+    """
+    return Subquery(
+        Participant.objects.filter(
+            user_id=user_ref
+        ).order_by().values('user_id').annotate(count=Count('*')).values('count')
+    )
+
+
+def annotated_users():
+    """
+    Users loading only the columns the user serializers read, annotated
+    with the active_conversations_count FastUserSerializer requires. Used
+    as the queryset of Prefetch()es of participants and senders.
+    """
+    return user.objects.only(*USER_READ_FIELDS).annotate(
+        active_conversations_count=active_conversations_count(OuterRef('pk'))
+    )
+
+
+def messages_with_senders(queryset):
+    """
+    Load `queryset`'s messages with only the columns the message serializers
+    read, and their senders through annotated_users().
+    """
+    return queryset.prefetch_related(
+        Prefetch('sender_id', queryset=annotated_users())
+    ).only(*FastMessageSerializer.source_fields)
+
+
+class ConversationViewSet(AutoPrefetchMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Conversation instances.
     Provides list, create, retrieve, update, and destroy actions.
@@ -34,14 +93,65 @@ class ConversationViewSet(viewsets.ModelViewSet):
     filterset_class = ConversationFilter
     search_fields = ['participants_id__email', 'participants_id__first_name']
     ordering_fields = ['created_at']
+    pagination_class = MessagePagination
+    
+    # how many of the latest messages a single conversation response embeds
+    recent_messages_limit = 50
+    
+    # rows fetched per round trip when a message list is served unpaginated
+    unpaginated_chunk_size = 2000
+    
+    def get_serializer_class(self):
+        """
+        List entries leave out the nested messages.
+        """
+        if self.action == 'list':
+            return ConversationListSerializer
+        return ConversationSerializer
     
     def get_queryset(self):
         """
         Filter conversations to only show those the user is a participant in.
+        
+        Message count, last message time and a preview of the last message
+        are annotated in SQL so the serializer doesn't query per conversation.
+        The preview keeps 51 characters so the serializer can tell whether
+        to append an ellipsis.
+        
+        Participants are prefetched so the nested serializers run a fixed
+        number of queries per page, loading only the columns UserSerializer
+        reads plus their annotated conversation counts. Actions that render
+        a single conversation also prefetch its latest messages (with their
+        senders, again only the rendered columns), bounded by
+        recent_messages_limit; the list doesn't render messages at all.
         """
-        return Conversation.objects.prefetch_related('participants_id', 'messages').filter(
-            participants_id__user_id=self.request.user.user_id
-        ).distinct()
+        last_message_preview = Message.objects.filter(
+            conversation_id=OuterRef('pk')
+        ).order_by('-sent_at').annotate(
+            preview=Substr('message_body', 1, 51)
+        ).values('preview')[:1]
+        
+        prefetches = [
+            Prefetch('participants_id', queryset=annotated_users()),
+        ]
+        if self.action in ('retrieve', 'update', 'partial_update'):
+            prefetches.append(Prefetch(
+                'messages',
+                queryset=messages_with_senders(
+                    Message.objects.order_by('-sent_at')
+                )[:self.recent_messages_limit],
+                # a sliced prefetch can't populate the related manager
+                to_attr='recent_messages',
+            ))
+        
+        queryset = Conversation.objects.prefetch_related(*prefetches).filter(
+            conversation_id__in=participant_conversation_ids(self.request)
+        ).annotate(
+            message_count=Count('messages', distinct=True),
+            last_message_at=Max('messages__sent_at'),
+            last_message_preview=Subquery(last_message_preview),
+        )
+        return self.auto_prefetch(queryset)
     
     def create(self, request, *args, **kwargs):
         """
@@ -63,6 +173,9 @@ class ConversationViewSet(viewsets.ModelViewSet):
         conversation.participants_id.add(request.user)
         conversation.participants_id.add(*participants)
         
+        # participants' cached /me payloads carry a now stale conversation count
+        invalidate_current_user_cache(request.user.pk, *(p.pk for p in participants))
+        
         # Return the created conversation with full details
         response_serializer = self.get_serializer(conversation)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
@@ -70,20 +183,36 @@ class ConversationViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def messages(self, request, pk=None):
         """
-        Get all messages for a specific conversation.
+        Get the messages of a specific conversation, paginated, newest first.
         URL: /conversations/{id}/messages/
+        
+        The ordering matches msg_conv_sent_id_idx, so each page is read in
+        index order instead of sorting the conversation's whole history.
         """
         conversation = self.get_object()
-        messages = conversation.messages.all().order_by('sent_at')
-        serializer = MessageSerializer(messages, many=True)
+        messages = messages_with_senders(
+            conversation.messages.order_by('-sent_at', '-message_id')
+        )
+        context = self.get_serializer_context()
+        
+        page = self.paginate_queryset(messages)
+        if page is not None:
+            serializer = FastMessageSerializer(page, many=True, context=context)
+            return self.get_paginated_response(serializer.data)
+        
+        # Without pagination, stream rows from the cursor in chunks rather
+        # than caching every model instance on the queryset
+        serializer = FastMessageSerializer(
+            messages.iterator(chunk_size=self.unpaginated_chunk_size), many=True, context=context
+        )
         return Response(serializer.data)
 
 
-class MessageViewSet(viewsets.ModelViewSet):
+class MessageViewSet(AutoPrefetchMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Message instances.
     Provides list, create, retrieve, update, and destroy actions.
-    Includes pagination (20 messages per page) and filtering.
+    Includes cursor pagination (20 messages per page, newest first) and filtering.
     
     Only allows users to access messages in conversations they are participants in.
     """
@@ -93,7 +222,19 @@ class MessageViewSet(viewsets.ModelViewSet):
     filterset_class = MessageFilter
     search_fields = ['message_body', 'sender_id__email']
     ordering_fields = ['sent_at']
-    pagination_class = MessagePagination
+    pagination_class = MessageCursorPagination
+    
+    # rows fetched per round trip when the list is served unpaginated
+    unpaginated_chunk_size = 2000
+    
+    def get_serializer_class(self):
+        """
+        Use the fast read-only serializer for GET requests and the DRF
+        serializer (with validation) for writes.
+        """
+        if self.request.method == 'GET':
+            return FastMessageSerializer
+        return MessageSerializer
     
     def get_queryset(self):
         """
@@ -104,72 +245,68 @@ class MessageViewSet(viewsets.ModelViewSet):
         
         if conversation_pk:
             # Nested route: filter by conversation and ensure user is a participant
-            return Message.objects.filter(
+            queryset = Message.objects.filter(
                 conversation_id=conversation_pk,
-                conversation_id__participants_id__user_id=self.request.user.user_id
-            ).select_related('sender_id', 'conversation_id').distinct()
+                conversation_id__in=participant_conversation_ids(self.request)
+            )
         else:
             # Regular route: show all messages in conversations the user participates in
-            return Message.objects.filter(
-                conversation_id__participants_id__user_id=self.request.user.user_id
-            ).select_related('sender_id', 'conversation_id').distinct()
+            queryset = Message.objects.filter(
+                conversation_id__in=participant_conversation_ids(self.request)
+            )
+        
+        # the sender is prefetched annotated, with only the columns the
+        # serializers render (leaving out e.g. the password hash); other
+        # related lookups are derived from the serializer
+        return self.auto_prefetch(messages_with_senders(queryset))
     
-    def create(self, request, *args, **kwargs):
+    def perform_create(self, serializer):
         """
         Send a message to an existing conversation.
-        The sender is automatically set to the authenticated user.
+        The sender is automatically set to the authenticated user, and on
+        the nested route the conversation is taken from the URL.
         Expected payload: {
             "conversation_id": <uuid>,
             "message_body": "text"
         }
+        Participation is checked by IsMessageSenderOrRecipient.has_permission,
+        which also parses the nested route's conversation_pk into a UUID.
         """
-        # Check if this is a nested route
+        extra = {'sender_id': self.request.user}
         conversation_pk = self.kwargs.get('conversation_pk')
-        
-        data = request.data.copy()
-        # Automatically set sender to the authenticated user
-        data['sender_id'] = request.user.user_id
-        
-        # If nested route, set conversation from URL
-        if conversation_pk:
-            data['conversation_id'] = conversation_pk
-        
-        serializer = self.get_serializer(data=data)
-        serializer.is_valid(raise_exception=True)
-        
-        # Verify user is a participant in the conversation
-        conversation = serializer.validated_data['conversation_id']
-        if not conversation.participants_id.filter(user_id=request.user.user_id).exists():
-            return Response(
-                {"detail": "You are not a participant in this conversation."},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        # Save the message
-        message = serializer.save()
-        
-        # Return the created message with full details
-        response_serializer = self.get_serializer(message)
-        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+        if conversation_pk is not None:
+            extra['conversation_id_id'] = conversation_pk
+        serializer.save(**extra)
     
     def list(self, request, *args, **kwargs):
         """
-        List all messages with pagination (20 per page).
-        Applies filters and ordering automatically through filter_backends.
-        Returns paginated response with count, next, previous, and results.
+        List all messages with cursor pagination (20 per page, newest first).
+        Applies filters and ordering automatically through filter_backends;
+        the paginator orders by (-sent_at, -message_id) unless ?ordering=
+        asks otherwise, always breaking ties by message_id. Returns paginated response with next, previous,
+        and results.
         """
         queryset = self.filter_queryset(self.get_queryset())
         
-        # Order by sent time
-        queryset = queryset.order_by('sent_at')
+        # Fetch plain rows instead of model instances, with each sender's
+        # conversation count computed in the same query
+        queryset = queryset.values(
+            *FastMessageRowSerializer.source_fields,
+            sender_active_conversations_count=active_conversations_count(OuterRef('sender_id')),
+        )
+        context = self.get_serializer_context()
         
         # Apply pagination
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
+            serializer = FastMessageRowSerializer(page, many=True, context=context)
             return self.get_paginated_response(serializer.data)
         
-        # Fallback if pagination is disabled
-        serializer = self.get_serializer(queryset, many=True)
+        # Fallback if pagination is disabled: stream the rows in chunks
+        # instead of caching them all on the queryset
+        serializer = FastMessageRowSerializer(
+            queryset.order_by('sent_at').iterator(chunk_size=self.unpaginated_chunk_size),
+            many=True, context=context
+        )
         return Response(serializer.data)
 
@@ -103,6 +103,19 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Argon2id first; the remaining hashers only verify existing hashes, which
+# are upgraded to the first hasher on the next successful login. The tuned
+# hasher also verifies argon2 hashes made with Django's stock parameters,
+# so the stock Argon2PasswordHasher (same algorithm name) isn't listed.
+# Requires the argon2-cffi package.
+PASSWORD_HASHERS = [
+    'chats.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -136,6 +149,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'chats.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
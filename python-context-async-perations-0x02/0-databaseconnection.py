@@ -23,7 +23,6 @@ if __name__ == "__main__": # Ensures that this block of code runs only when the
     with DatabaseConnection('users.db') as conn: # DatabaseConnection('users.db') creates an instance of your class, passing 'users.db' as the database name.
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM users;")
-        # fetchall() returns a list of tuples, where each tuple represents a row from the table.
-        rows = cursor.fetchall()
-        for row in rows:
+        # iterating the cursor yields one tuple per row, without loading the whole result into a list first.
+        for row in cursor:
             print(row)
\ No newline at end of file
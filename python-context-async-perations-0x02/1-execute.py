@@ -3,6 +3,9 @@ import sqlite3
 # Implement a class based custom context manager ExecuteQuery that takes the query: ”SELECT * FROM users WHERE age > ?” and the parameter 25 and returns the result of the query
 
 class ExecuteQuery:
+    # rows fetched from sqlite per batch while iterating the results
+    batch_size = 1000
+
     def __init__(self, db_name, query, param):
         self.db_name = db_name
         self.query = query
@@ -14,9 +17,20 @@ class ExecuteQuery:
         # open the database connection
         self.connection = sqlite3.connect(self.db_name)
         self.cursor = self.connection.cursor()
+        self.cursor.arraysize = self.batch_size
         # execute the query with the parameter
         self.cursor.execute(self.query, (self.param,))
-        return self.cursor.fetchall()  # fetch and return all results
+        # return the manager itself; iterating it streams the results in
+        # batches instead of building the full result list up front
+        return self
+
+    def __iter__(self):
+        # yield the results row by row, fetching batch_size rows at a time
+        while True:
+            rows = self.cursor.fetchmany()
+            if not rows:
+                break
+            yield from rows
 
     def __exit__(self, exc_type, exc_value, traceback):
         # close the cursor and database connection
@@ -5,32 +5,33 @@ import aiosqlite
 
 DB_NAME = "users.db"
 
-async def async_fetch_users():
-    async with aiosqlite.connect(DB_NAME) as db:
-        async with db.execute("SELECT * FROM users;") as cursor:
-            rows = await cursor.fetchall()
-            print("All users:")
-            for row in rows:
-                print(row)
-            return rows
+async def async_fetch_users(db):
+    async with db.execute("SELECT * FROM users;") as cursor:
+        rows = await cursor.fetchall()
+        print("All users:")
+        for row in rows:
+            print(row)
+        return rows
 
 # Fetch users older than 40
-async def async_fetch_older_users():
-    async with aiosqlite.connect(DB_NAME) as db:
-        async with db.execute("SELECT * FROM users WHERE age > 40;") as cursor:
-            rows = await cursor.fetchall()
-            print("\nUsers older than 40:")
-            for row in rows:
-                print(row)
-            return rows
+async def async_fetch_older_users(db):
+    async with db.execute("SELECT * FROM users WHERE age > 40;") as cursor:
+        rows = await cursor.fetchall()
+        print("\nUsers older than 40:")
+        for row in rows:
+            print(row)
+        return rows
 
 async def fetch_concurrently():
-    # Run both queries at the same time
-    results = await asyncio.gather(
-        async_fetch_users(),
-        async_fetch_older_users()
-    )
+    # Both queries share one connection instead of each opening its own;
+    # aiosqlite runs them on the connection's worker thread
+    async with aiosqlite.connect(DB_NAME) as db:
+        # Run both queries at the same time
+        results = await asyncio.gather(
+            async_fetch_users(db),
+            async_fetch_older_users(db)
+        )
     return results
 
 if __name__ == "__main__":
-    asyncio.run(fetch_concurrently())
\ No newline at end of file
+    asyncio.run(fetch_concurrently())
@@ -1,12 +1,18 @@
 import sqlite3
 import functools
-from datetime import datetime
+
+# set to False to skip query logging; log_queries then returns the function
+# undecorated, so calls pay no wrapper overhead
+LOG_QUERIES = True
 
 
 # first what is a decorator? A decorator is a function that takes another function as an argument, extends its behavior, and returns a new function. 
 # Decorators are often used for logging, access control, instrumentation, and caching.
 # Decorator to log SQL queries before execution
 def log_queries(func):
+    if not LOG_QUERIES:
+        return func
+
     @functools.wraps(func)  # preserves the original function's metadata
     def wrapper(*args, **kwargs):
         # Try to get the SQL query from keyword arguments or first positional argument
@@ -2,30 +2,75 @@
 
 import sqlite3 
 import functools
+import queue
+
+DB_PATH = 'users.db'
+
+# Connections are pooled instead of opened and closed on every call: opening
+# one (file open, schema parse, PRAGMA setup) costs far more than the short
+# queries these helpers run. The pool fills lazily up to _POOL_SIZE idle
+# connections; extra concurrent callers get a fresh connection that is
+# closed when they are done.
+_POOL_SIZE = 8
+_pool = queue.LifoQueue(maxsize=_POOL_SIZE)
+
+
+def _connect():
+    """Open a connection configured for pooled use"""
+    # isolation_level=None (autocommit) so a connection never goes back to
+    # the pool with a transaction left open; transactional() opens its own
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA cache_size=-64000')
+    # wait up to 5s for a lock inside SQLite before raising 'database is locked'
+    conn.execute('PRAGMA busy_timeout=5000')
+    return conn
+
+
+def _acquire():
+    """Take an idle pooled connection, or open a new one"""
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        return _connect()
+
+
+def _release(conn):
+    """Return a connection to the pool, or close it if the pool is full"""
+    if conn.in_transaction:
+        conn.rollback()
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
 
 def with_db_connection(func):
     """ your code goes here""" 
     @functools.wraps(func)  # preserve metadata of the original function
     def wrapper(*args, **kwargs):
         
-        # Open the database connection 
-        conn = sqlite3.connect('users.db') 
+        # Borrow a database connection from the pool
+        conn = _acquire()
         try: 
             # Pass the connection as the first argument to the function
-            result = func(conn, *args, **kwargs) 
+            return func(conn, *args, **kwargs) 
         finally: 
-            # Ensure the connection is always closed
-            conn.close() 
-        return result 
+            # Ensure the connection is always handed back
+            _release(conn) 
     return wrapper
 
 # Function that now receives a database connection automatically
 @with_db_connection 
 def get_user_by_id(conn, user_id): 
-cursor = conn.cursor() 
-cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,)) 
-return cursor.fetchone() 
-#### Fetch user by ID with automatic connection handling 
+    cursor = conn.cursor() 
+    cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,)) 
+    return cursor.fetchone() 
+
+
+if __name__ == '__main__':
+    #### Fetch user by ID with automatic connection handling 
 
-user = get_user_by_id(user_id=1)
-print(user)
\ No newline at end of file
+    user = get_user_by_id(user_id=1)
+    print(user)
@@ -2,35 +2,35 @@
 import sqlite3
 import functools
 
+# shares the pooled connection decorator
+with_db_connection = __import__('1-with_db_connection').with_db_connection
+
 def transactional(func):
     @functools.wraps(func)  # preserve metadata of the original function
-    def wrapper(*args, **kwargs):
-        # Open the database connection
-        conn = sqlite3.connect('users.db')
+    def wrapper(conn, *args, **kwargs):
+        # Use the connection with_db_connection passes in rather than
+        # opening a second one
         try:
-            # Start a transaction
-            conn.execute('BEGIN;')
-            # Pass the connection as the first argument to the function
-            result = func(conn, *args, **kwargs)
-            # Commit the transaction if no exceptions occurred
-            conn.commit()
+            # Pooled connections run in autocommit mode, so start the
+            # transaction explicitly; `with conn` commits it if no exception
+            # occurred and rolls it back otherwise
+            with conn:
+                conn.execute('BEGIN')
+                return func(conn, *args, **kwargs)
         except Exception as e:
-            # Rollback the transaction in case of an error
-            conn.rollback()
             print(f"Transaction failed: {e}")
             raise  # Re-raise the exception after rollback
-        finally:
-            # Ensure the connection is always closed
-            conn.close()
-        return result
     return wrapper
 
 # Function that now receives a database connection automatically
 @with_db_connection 
 @transactional 
 def update_user_email(conn, user_id, new_email): 
-cursor = conn.cursor() 
-cursor.execute("UPDATE users SET email = ? WHERE id = ?", (new_email, user_id)) 
-#### Update user's email with automatic transaction handling 
+    cursor = conn.cursor() 
+    cursor.execute("UPDATE users SET email = ? WHERE id = ?", (new_email, user_id)) 
+
+
+if __name__ == '__main__':
+    #### Update user's email with automatic transaction handling 
 
-update_user_email(user_id=1, new_email='Crawford_Cartwright@hotmail.com')
\ No newline at end of file
+    update_user_email(user_id=1, new_email='Crawford_Cartwright@hotmail.com')
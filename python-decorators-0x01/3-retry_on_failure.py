@@ -2,34 +2,54 @@
 import sqlite3
 import functools
 import time
+import random
+
+# shares the pooled connection decorator
+with_db_connection = __import__('1-with_db_connection').with_db_connection
+
+# OperationalError messages of failures that may succeed when retried;
+# anything else (a missing table, a syntax error) fails immediately
+TRANSIENT_ERRORS = ('locked', 'busy')
+
+
+def is_transient(error):
+    message = str(error).lower()
+    return any(text in message for text in TRANSIENT_ERRORS)
+
 
 # Decorator to retry database operations
-def retry_db_operation(retries=3, delay=2):
+def retry_on_failure(retries=3, delay=2, max_delay=30):
     def decorator(func):
         @functools.wraps(func)  # preserves the original function's metadata
         def wrapper(*args, **kwargs):
-            last_exception = None
             for attempt in range(retries):
                 try:
                     return func(*args, **kwargs)  # Try to execute the decorated function
                 except sqlite3.OperationalError as e:
-                    last_exception = e
-                    print(f"[RETRY] Attempt {attempt + 1} failed: {e}. Retrying in {delay} seconds...")
-                    time.sleep(delay)  # Wait before retrying
-            print(f"[FAILURE] All {retries} attempts failed.")
-            raise last_exception  # Raise the last exception if all retries fail
+                    if not is_transient(e):
+                        print(f"[FAILURE] Non-transient error, not retrying: {e}")
+                        raise
+                    if attempt == retries - 1:
+                        print(f"[FAILURE] All {retries} attempts failed.")
+                        raise
+                    # Exponential backoff with jitter, so concurrent callers
+                    # don't all retry at the same moment
+                    wait = min(max_delay, delay * 2 ** attempt) * random.uniform(0.5, 1.5)
+                    print(f"[RETRY] Attempt {attempt + 1} failed: {e}. Retrying in {wait:.2f} seconds...")
+                    time.sleep(wait)  # Wait before retrying
         return wrapper  # return the wrapped function
     return decorator  # return the decorator
 
 @with_db_connection
 @retry_on_failure(retries=3, delay=1)
-
 def fetch_users_with_retry(conn):
-cursor = conn.cursor()
-cursor.execute("SELECT * FROM users")
-return cursor.fetchall()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM users")
+    return cursor.fetchall()
+
 
-#### attempt to fetch users with automatic retry on failure
+if __name__ == '__main__':
+    #### attempt to fetch users with automatic retry on failure
 
-users = fetch_users_with_retry()
-print(users)
\ No newline at end of file
+    users = fetch_users_with_retry()
+    print(users)
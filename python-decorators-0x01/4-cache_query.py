@@ -1,24 +1,42 @@
 # create a decorator that caches the results of a database queries inorder to avoid redundant calls
 import sqlite3
 import functools
-from datetime import datetime
+import collections
+import time
+
+# shares the pooled connection decorator
+with_db_connection = __import__('1-with_db_connection').with_db_connection
+
+CACHE_MAX_SIZE = 128  # cached results kept before the least recently used is evicted
+CACHE_TTL = 300  # seconds a cached result may be returned
+
 
 # Decorator to cache SQL query results
 def cache_query(func):
-    cache = {}  # dictionary to store cached results
+    # LRU order: most recently used results at the end
+    cache = collections.OrderedDict()  # key -> (cached_at, result)
 
     @functools.wraps(func)  # preserves the original function's metadata
     def wrapper(*args, **kwargs):
-        query = kwargs.get("query") or (args[0] if args else None)
+        query = kwargs.get("query") or (args[1] if len(args) > 1 else None)
+        # args[0] is the connection; every other argument (the query and its
+        # parameters) is part of the key
+        key = (args[1:], tuple(sorted(kwargs.items())))
+        now = time.monotonic()
         
-        # Check if the result is already in the cache
-        if query in cache:
+        # Check if a fresh result is already in the cache
+        entry = cache.get(key)
+        if entry is not None and now - entry[0] < CACHE_TTL:
+            cache.move_to_end(key)
             print(f"[CACHE] Returning cached result for query: {query}")
-            return cache[query]
+            return entry[1]
         
         # If not in cache, execute the function and store the result
         result = func(*args, **kwargs)
-        cache[query] = result  # store the result in the cache
+        cache[key] = (now, result)  # store the result in the cache
+        cache.move_to_end(key)
+        if len(cache) > CACHE_MAX_SIZE:
+            cache.popitem(last=False)  # evict the least recently used
         print(f"[CACHE] Caching result for query: {query}")
         return result
 
@@ -32,8 +50,9 @@ def fetch_users_with_cache(conn, query):
     cursor.execute(query)
     return cursor.fetchall()
 
-#### First call will cache the result
-users = fetch_users_with_cache(query="SELECT * FROM users")
+if __name__ == '__main__':
+    #### First call will cache the result
+    users = fetch_users_with_cache(query="SELECT * FROM users")
 
-#### Second call will use the cached result
-users_again = fetch_users_with_cache(query="SELECT * FROM users")
\ No newline at end of file
+    #### Second call will use the cached result
+    users_again = fetch_users_with_cache(query="SELECT * FROM users")
@@ -21,22 +21,28 @@ def stream_users():
         host=DB_HOST,
         user=DB_USER,
         password=DB_PASSWORD,
-        database=DB_NAME
+        database=DB_NAME,
+        use_pure=False  # decode rows in the C extension, not in Python
     )
 
-    # Use dictionary cursor for easier access
+    # Use dictionary cursor for easier access; it is unbuffered, so rows
+    # stay on the server until the loop fetches them
     cursor = connection.cursor(dictionary=True)
 
-    # Execute the query
-    cursor.execute("SELECT * FROM user_data;")
+    try:
+        # Execute the query
+        cursor.execute("SELECT * FROM user_data;")
 
-    # Yield rows one by one
-    for row in cursor:  # only one loop
-        yield row
-
-    # Clean up resources
-    cursor.close()
-    connection.close()
+        # Yield rows one by one
+        for row in cursor:  # only one loop
+            yield row
+    finally:
+        # Clean up resources; runs when the generator is exhausted or
+        # closed early. Rows left unread must be drained before the cursor
+        # can be closed
+        connection.consume_results()
+        cursor.close()
+        connection.close()
 
 
 # Optional: test the generator
@@ -49,4 +55,4 @@ if __name__ == "__main__":
 #   executes a query to fetch all rows from the user_data table, and yields each row
 #   one by one using a single loop and yield statement.
 # a generator is a function that returns an iterator that produces a sequence of values using the yield statement.
-# - The connection and cursor are properly closed after the iteration is complete.
+# - The connection and cursor are properly closed after the iteration is complete, or when the caller stops early.
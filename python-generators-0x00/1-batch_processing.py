@@ -3,7 +3,6 @@
 import mysql.connector
 import os
 from dotenv import load_dotenv
-from itertools import islice
 
 load_dotenv()
 
@@ -13,29 +12,40 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 
 
-def stream_users_in_batches(batch_size):
+def stream_users_in_batches(batch_size, min_age=None):
     
     # Generator that fetches rows from user_data in batches.
     # Yields lists of users, each list has at most batch_size rows.
+    # With min_age, only users older than min_age are fetched; the filter
+    # runs in SQL so skipped rows are never sent to the client.
 
     connection = mysql.connector.connect(
         host=DB_HOST,
         user=DB_USER,
         password=DB_PASSWORD,
-        database=DB_NAME
+        database=DB_NAME,
+        use_pure=False  # decode rows in the C extension, not in Python
     )
 
+    # unbuffered cursor: rows stay on the server until fetched
     cursor = connection.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM user_data;")
-
-    while True:
-        batch = list(islice(cursor, batch_size))
-        if not batch:
-            break
-        yield batch
+    try:
+        if min_age is None:
+            cursor.execute("SELECT * FROM user_data;")
+        else:
+            cursor.execute("SELECT * FROM user_data WHERE age > %s;", (min_age,))
 
-    cursor.close()
-    connection.close()
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield batch
+    finally:
+        # runs when the generator is exhausted or closed early; rows left
+        # unread must be drained before the cursor can be closed
+        connection.consume_results()
+        cursor.close()
+        connection.close()
     return "All batches processed"  # final return value after generator is exhausted
 
 
@@ -43,10 +53,9 @@ def batch_processing(batch_size):
     
     # Processes batches and yields users over the age of 25 one by one.
     
-    for batch in stream_users_in_batches(batch_size):
+    for batch in stream_users_in_batches(batch_size, min_age=25):
         for user in batch:
-            if user['age'] > 25:
-                yield user
+            yield user
     return "Batch processing complete"  # final return after all batches
 
 
@@ -61,8 +70,8 @@ if __name__ == "__main__":
     except StopIteration as e:
         print(e.value)  # prints "Batch processing complete"
 # Main Points to keep in mind:
-# - The function stream_users_in_batches is a generator that fetches rows from the user_data table in batches of a specified size using islice.
-# - The function batch_processing processes these batches and yields users over the age of 25 one by one.
+# - The function stream_users_in_batches is a generator that fetches rows from the user_data table in batches of a specified size using fetchmany.
+# - The function batch_processing processes these batches and yields users over the age of 25 one by one; the age filter is applied in the SQL query.
 # - Both generators have a final return statement that provides a message when the generator is exhausted.
 # - The test code demonstrates how to capture the return value of the generator using StopIteration exception handling.
-# - The connection and cursor are properly closed after the iteration is complete.
\ No newline at end of file
+# - The connection and cursor are properly closed after the iteration is complete, or when the caller stops early.
\ No newline at end of file
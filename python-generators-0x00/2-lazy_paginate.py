@@ -2,34 +2,87 @@
 # Objective: Simulte fetching paginated data from the users database using a generator to lazily load each page
 
 #!/usr/bin/python3
+import functools
+import time
+
 seed = __import__('seed')
 
+PAGE_CACHE_SIZE = 64  # pages paginate_users keeps in memory
+PAGE_CACHE_TTL = 30  # seconds a cached page may be served
+
+
+def select_columns(columns):
+    # Validate the requested columns and return them as an SQL select list;
+    # column names can't be query parameters, so only known ones are allowed
+    unknown = set(columns) - set(seed.USER_DATA_COLUMNS)
+    if not columns or unknown:
+        raise ValueError(f"Unknown user_data columns: {sorted(unknown)}")
+    return ', '.join(columns)
 
-def paginate_users(page_size, offset):
+
+def paginate_users(page_size, last_id='', columns=seed.USER_DATA_COLUMNS):
 
     # Fetch a single page of users from the database.
+    # Keyset pagination: the page starts after last_id (the user_id ending
+    # the previous page; '' for the first page, as CHAR(36) ids sort as
+    # strings), so the primary key index seeks straight to it instead of
+    # scanning and discarding OFFSET rows.
+    # Only the given columns are selected.
+    # Pages fetched within the last PAGE_CACHE_TTL seconds are served from
+    # an in-process cache, which holds plain tuples; each call gets freshly
+    # built dicts, so callers may modify the rows they receive.
+
+    columns = tuple(columns)
+    ttl_tick = int(time.monotonic() // PAGE_CACHE_TTL)
+    return [dict(zip(columns, row))
+            for row in fetch_page(page_size, last_id, columns, ttl_tick)]
 
+
+# LRU cache of recent pages; ttl_tick changes every PAGE_CACHE_TTL seconds,
+# so older entries are never hit again and get evicted as new pages arrive.
+# Rows are cached as tuples of values in the order of columns, so no caller
+# can change what later callers are served.
+@functools.lru_cache(maxsize=PAGE_CACHE_SIZE)
+def fetch_page(page_size, last_id, columns, ttl_tick):
     connection = seed.connect_to_prodev()
-    cursor = connection.cursor(dictionary=True)
-    cursor.execute(f"SELECT * FROM user_data LIMIT {page_size} OFFSET {offset}")
-    rows = cursor.fetchall()
-    cursor.close()
-    connection.close()
-    return rows
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            f"SELECT {select_columns(columns)} FROM user_data "
+            "WHERE user_id > %s ORDER BY user_id LIMIT %s",
+            (last_id, page_size)
+        )
+        return tuple(cursor.fetchall())
+    finally:
+        cursor.close()
+        connection.close()
 
 
-def lazy_pagination(page_size):
+def lazy_pagination(page_size, columns=seed.USER_DATA_COLUMNS):
     
     # Generator function that yields pages of users lazily.
-    # Only fetches the next page when needed.
+    # A single query streams the whole table through an unbuffered
+    # cursor; each page is just the next page_size rows read from it, so
+    # the query is parsed and planned once and all pages come from one
+    # consistent snapshot. Only the given columns are selected.
+    # paginate_users remains for fetching a single page on its own.
 
-    offset = 0
-    while True:  # Only one loop
-        page = paginate_users(page_size, offset)
-        if not page:  # No more rows
-            break
-        yield page  # Yield the current page
-        offset += page_size  # Move to the next page
+    select_list = select_columns(columns)  # validated before connecting
+    connection = seed.connect_to_prodev()
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(f"SELECT {select_list} FROM user_data ORDER BY user_id")
+        while True:  # Only one loop
+            page = cursor.fetchmany(page_size)
+            if not page:  # No more rows
+                break
+            yield page  # Yield the current page
+    finally:
+        # runs when the generator is exhausted or closed early; rows left
+        # unread must be drained before the connection can be reused
+        connection.consume_results()
+        cursor.close()
+        connection.close()
 
 
 # Optional test
@@ -40,7 +93,6 @@ if __name__ == "__main__":
 # Main Points to keep in mind:
 # - The function lazy_pagination is a generator that fetches pages of users from the user_data table lazily.
 # - It uses a while loop to continuously fetch pages until no more rows are returned.
-# - Each page is fetched using the paginate_users function, which takes page_size and offset as arguments.
+# - The pages are read with fetchmany from a single streaming query; the paginate_users function fetches one page on its own, taking page_size and the last user_id seen as arguments.
 # - The generator yields each page of users, allowing the caller to process one page at a time.
-# - The offset is incremented by page_size after each yield to fetch the next page in the subsequent iteration.
 # - The connection and cursor are properly closed after fetching each
\ No newline at end of file
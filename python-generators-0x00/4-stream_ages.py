@@ -2,35 +2,101 @@
 # Objective: to use a generator to compute a memory-efficient aggregate function i.e average age for a large dataset
 
 #!/usr/bin/python3
+from concurrent.futures import ThreadPoolExecutor
+
 seed = __import__('seed')
 
+FETCH_SIZE = 10000  # ages read from the cursor at a time
+
 
 def stream_user_ages():
    
     # Generator that yields user ages one by one from the user_data table.
    
     connection = seed.connect_to_prodev()
-    cursor = connection.cursor(dictionary=True)
-    cursor.execute("SELECT age FROM user_data;")
+    # plain tuple rows: no dict is built per row for a single column
+    cursor = connection.cursor()
+    try:
+        # cast in SQL so the driver hands back floats rather than Decimals,
+        # which are far slower for callers doing arithmetic on the ages
+        cursor.execute("SELECT CAST(age AS DOUBLE) FROM user_data;")
+
+        while True:  # Only one loop
+            # read FETCH_SIZE rows per call instead of one row per next()
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            yield from (row[0] for row in rows)
+    finally:
+        # runs when the generator is exhausted or closed early; rows left
+        # unread must be drained before the cursor can be closed
+        connection.consume_results()
+        cursor.close()
+        connection.close()
+
+
+def sum_ages(lower=None, upper=None):
+
+    # SUM and COUNT of the ages of users with lower <= user_id < upper
+    # (either bound may be open), computed by the database
+    conditions, params = [], []
+    if lower is not None:
+        conditions.append("user_id >= %s")
+        params.append(lower)
+    if upper is not None:
+        conditions.append("user_id < %s")
+        params.append(upper)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    connection = seed.connect_to_prodev()
+    if connection is None:
+        # connect_to_prodev already printed why, e.g. an exhausted pool
+        raise RuntimeError(f"No connection to {seed.DB_NAME} available")
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT SUM(age), COUNT(*) FROM user_data{where};", params)
+        total, count = cursor.fetchone()
+    finally:
+        cursor.close()
+        connection.close()
+    return total or 0, count
 
-    for row in cursor:  # Only one loop
-        yield row['age']
 
-    cursor.close()
-    connection.close()
+def user_id_ranges(partitions):
 
+    # Split the user_id key space into contiguous (lower, upper) ranges.
+    # uuid4 ids start with uniformly distributed hex digits, so splitting on
+    # the first four of them gives ranges of roughly equal size.
+    bounds = [format(i * 16 ** 4 // partitions, '04x') for i in range(1, partitions)]
+    return list(zip([None] + bounds, bounds + [None]))
 
-def compute_average_age():
+
+def compute_average_age(partitions=1):
     
-   # Computes the average age of users using the stream_user_ages generator.
+   # Computes the average age of users.
+   # The database aggregates the ages itself and returns one row, so no
+   # ages cross the network; stream_user_ages remains for callers that
+   # need the individual values.
+   # With partitions > 1 the table is aggregated as that many user_id
+   # ranges queried concurrently, each on its own pooled connection, and
+   # the partial sums are combined here. This only pays off when the
+   # server can scan the ranges in parallel. If the pool can't hand out a
+   # connection per range (other callers hold some), the whole table is
+   # aggregated with a single query instead.
     
-    total = 0
-    count = 0
-
-    for age in stream_user_ages():  # Loop 2
-        total += age
-        count += 1
+    partitions = max(1, min(partitions, seed.POOL_SIZE))
+    partials = None
+    if partitions > 1:
+        try:
+            with ThreadPoolExecutor(max_workers=partitions) as executor:
+                partials = list(executor.map(lambda bounds: sum_ages(*bounds), user_id_ranges(partitions)))
+        except RuntimeError:
+            partials = None
+    if partials is None:
+        partials = [sum_ages()]
 
+    total = sum(total for total, _ in partials)
+    count = sum(count for _, count in partials)
     if count == 0:
         return 0
     return total / count
@@ -42,10 +108,9 @@ if __name__ == "__main__":
 
 # Main Points to keep in mind:
 # - The function stream_user_ages is a generator that connects to the database, executes a query to fetch all ages from the user_data table, and yields each age one by one using a single loop and yield statement.
-# - The function compute_average_age uses the stream_user_ages generator to compute the average age of users by iterating over the ages yielded by the generator.
+# - The function compute_average_age lets MySQL sum and count the ages, fetching a single row per user_id range instead of every age; with partitions > 1 the ranges are queried concurrently.
 # - Both functions ensure that the database connection and cursor are properly closed after use.
 # - This approach is memory-efficient as it does not load all ages into memory at once, but processes them one by one.
-# - The average age is computed by maintaining a running total and count of ages, and the final average is calculated after the iteration is complete.
 # - The test code in the __main__ block demonstrates how to call the compute_average_age function and print the result.
 # a generator is a function that returns an iterator that produces a sequence of values using the yield statement.
 # - The connection and cursor are properly closed after the iteration is complete.
\ No newline at end of file
@@ -1,7 +1,9 @@
 import mysql.connector
+from mysql.connector import pooling
 import csv
 import os
 import uuid
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,7 +11,30 @@ load_dotenv()
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_USER = os.getenv("DB_USER", "root")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "")
+DB_SOCKET = os.getenv("DB_SOCKET", "/var/run/mysqld/mysqld.sock")
 DB_NAME = "ALX_prodev"
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+POOL_SIZE = 5
+INSERT_BATCH_SIZE = 1000  # rows sent per executemany() in insert_data
+
+# Pool of ALX_prodev connections, created on first use so importing this
+# module doesn't require the database to exist yet
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def server_options():
+
+    # Options locating the MySQL server plus the driver settings shared by
+    # every connection. A local server is reached through its UNIX socket
+    # when there is one, skipping the TCP stack; use_pure=False selects
+    # mysql.connector's C extension instead of its pure Python protocol.
+    options = {'user': DB_USER, 'password': DB_PASSWORD, 'use_pure': False}
+    if DB_HOST in ('localhost', '127.0.0.1') and os.path.exists(DB_SOCKET):
+        options['unix_socket'] = DB_SOCKET
+    else:
+        options['host'] = DB_HOST
+    return options
 
 
 def connect_db():
@@ -17,11 +42,7 @@ def connect_db():
     # Connect to the MySQL server (not a specific database)
     # Returns the connection object
     try:
-        connection = mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD
-        )
+        connection = mysql.connector.connect(**server_options())
         return connection
     except mysql.connector.Error as e:
         print(f"Error connecting to MySQL: {e}")
@@ -39,15 +60,22 @@ def create_database(connection):
 def connect_to_prodev():
     
     # Connect to the ALX_prodev database
-    # Returns the connection object
+    # Returns a pooled connection object; closing it hands it back to the
+    # pool instead of tearing down the connection and login
+    global _pool
     try:
-        connection = mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_NAME
-        )
-        return connection
+        with _pool_lock:  # callers may run in threads
+            if _pool is None:
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name="prodev",
+                    pool_size=POOL_SIZE,
+                    database=DB_NAME,
+                    # LOAD DATA LOCAL INFILE (see insert_data) may only read
+                    # files from this project's directory
+                    allow_local_infile_in_path=BASE_DIR,
+                    **server_options()
+                )
+        return _pool.get_connection()
     except mysql.connector.Error as e:
         print(f"Error connecting to {DB_NAME}: {e}")
         return None
@@ -57,10 +85,10 @@ def create_table(connection):
     """
     Create the user_data table if it does not exist
     Fields:
-        user_id: PRIMARY KEY, UUID, Indexed
+        user_id: PRIMARY KEY, UUID, Indexed (by the primary key)
         name: VARCHAR NOT NULL
         email: VARCHAR NOT NULL
-        age: DECIMAL NOT NULL
+        age: DECIMAL NOT NULL, Indexed
     """
     cursor = connection.cursor()
     create_table_query = f"""
@@ -69,15 +97,64 @@ def create_table(connection):
         name VARCHAR(255) NOT NULL,
         email VARCHAR(255) NOT NULL,
         age DECIMAL(5,2) NOT NULL,
-        INDEX idx_user_id (user_id)
+        INDEX idx_age (age)
     );
     """
     cursor.execute(create_table_query)
+
+    # Tables created before idx_user_id was dropped from the definition
+    # still carry it; it duplicates the primary key index, so remove it
+    cursor.execute(
+        "SELECT 1 FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'user_data' "
+        "AND index_name = 'idx_user_id' LIMIT 1"
+    )
+    if cursor.fetchone():
+        cursor.execute("ALTER TABLE user_data DROP INDEX idx_user_id")
+
     connection.commit()
     cursor.close()
     print("Table user_data created successfully")
 
 
+# columns of user_data; the CSV header may list them in any order
+USER_DATA_COLUMNS = ('user_id', 'name', 'email', 'age')
+
+
+def load_data_infile(cursor, csv_file):
+    """
+    Bulk load the CSV file with LOAD DATA LOCAL INFILE, letting the server
+    parse it in one statement. Rows whose user_id already exists are
+    skipped. Returns False when the statement can't run (e.g. local_infile
+    is disabled on the server), so the caller can insert the rows itself.
+    """
+    with open(csv_file, newline='') as f:
+        first_line = f.readline()
+    header = next(csv.reader([first_line]), [])
+    # only take the fast path for exactly the columns insert_data reads
+    # (in any order), so both paths accept and reject the same files
+    if sorted(header) != sorted(USER_DATA_COLUMNS):
+        return False  # let insert_data handle or report the other layouts
+    # csv.writer ends lines with \r\n by default
+    line_end = '\\r\\n' if first_line.endswith('\r\n') else '\\n'
+
+    # parse fields like the csv module does: a doubled quote inside quotes
+    # is a quote, and a backslash is an ordinary character, not MySQL's
+    # default escape
+    try:
+        cursor.execute(
+            "LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE user_data "
+            "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+            f"LINES TERMINATED BY '{line_end}' IGNORE 1 LINES "
+            f"({', '.join(header)})",
+            (os.path.abspath(csv_file),)
+        )
+    except mysql.connector.Error as e:
+        print(f"LOAD DATA LOCAL INFILE unavailable ({e}), inserting in batches")
+        return False
+    return True
+
+
 def insert_data(connection, csv_file):
     """
     Insert data from CSV file into user_data table if it does not exist
@@ -85,19 +162,23 @@ def insert_data(connection, csv_file):
     """
     cursor = connection.cursor()
 
-    with open(csv_file, newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Check if user_id already exists
-            cursor.execute("SELECT user_id FROM user_data WHERE user_id=%s", (row['user_id'],))
-            if cursor.fetchone():
-                continue  # Skip if already exists
-
-            # Insert new row
-            cursor.execute(
-                "INSERT INTO user_data (user_id, name, email, age) VALUES (%s, %s, %s, %s)",
-                (row['user_id'], row['name'], row['email'], row['age'])
-            )
+    if not load_data_infile(cursor, csv_file):
+        # INSERT IGNORE skips rows whose user_id (the primary key) already
+        # exists, so no query is needed to check for them first
+        query = "INSERT IGNORE INTO user_data (user_id, name, email, age) VALUES (%s, %s, %s, %s)"
+
+        # Send the rows INSERT_BATCH_SIZE at a time, so a batch is one
+        # multi-row INSERT rather than a round trip per row
+        batch = []
+        with open(csv_file, newline='') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                batch.append((row['user_id'], row['name'], row['email'], row['age']))
+                if len(batch) == INSERT_BATCH_SIZE:
+                    cursor.executemany(query, batch)
+                    batch = []
+        if batch:
+            cursor.executemany(query, batch)
 
     connection.commit()
     cursor.close()